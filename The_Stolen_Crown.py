@@ -3,14 +3,38 @@ __author__ = 'justinarmstrong'
 
 """This is a fantasy RPG game about a warrior whose
 quest is to recover a magic crown"""
-    
-import sys
+
+import argparse, os, sys
 import pygame as pg
-from data import setup
-from data.main import main
+from data import profiler
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='The Stolen Crown')
+    parser.add_argument('--profile-startup', nargs='?', const='-',
+                        metavar='FILE',
+                        help='time startup, write the report as json to '
+                             'FILE (or print it) and exit')
+    parser.add_argument('--turbo', type=int, metavar='STEPS',
+                        help='run STEPS simulation steps as fast as possible '
+                             'with no window or sound, report the speed '
+                             'and exit')
+    parser.add_argument('--turbo-draw', action='store_true',
+                        help='with --turbo, draw every step too')
+    return parser.parse_args()
+
 
 if __name__ =='__main__':
+    args = parse_args()
+    if args.profile_startup:
+        profiler.start(args.profile_startup)
+    if args.turbo is not None:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    with profiler.phase('import setup'):
+        from data import setup
+    from data.main import main
     setup.GAME
-    main()
+    main(args.turbo, args.turbo_draw)
     pg.quit()
     sys.exit()
@@ -0,0 +1,84 @@
+"""
+Lazy asset registries.  setup.GFX, setup.SFX and setup.FONTS are
+AssetRegistry objects: they know the name of every asset in their
+directory, but a file is only decoded the first time it is looked up.
+Decoded assets live in a size-bounded LRU cache.
+"""
+from . import cache, profiler, tools
+
+
+class AssetRegistry(object):
+    """
+    Dictionary-like collection of the assets in a directory,
+    decoded on demand.
+    """
+    def __init__(self, directory, accept, loader=None, max_bytes=None,
+                 sizeof=cache.value_bytes):
+        self.directory = directory
+        self.loader = loader
+        self.paths = tools.find_files(directory, accept)
+        self.cache = cache.LRUCache(max_bytes, sizeof)
+        self.decode_time = 0.0
+        self.decode_count = 0
+
+    def __getitem__(self, name):
+        asset = self.cache.get(name)
+        if asset is None:
+            asset = self.load(name)
+        return asset
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def keys(self):
+        return list(self.paths)
+
+    def get(self, name, default=None):
+        if name in self.paths:
+            return self[name]
+        return default
+
+    def load(self, name):
+        """
+        Decode an asset and add it to the cache.
+        """
+        path = self.paths[name]
+        if self.loader is None:
+            return self.cache.put(name, path)
+
+        start = cache.timer()
+        asset = self.loader(path)
+        elapsed = cache.timer() - start
+        self.decode_time += elapsed
+        self.decode_count += 1
+        profiler.record('decode ' + path, elapsed)
+
+        return self.cache.put(name, asset)
+
+    def preload(self, names=None):
+        """
+        Decode the named assets (or every asset) ahead of time.
+        """
+        if names is None:
+            names = self.paths
+
+        for name in names:
+            if name not in self.cache:
+                self.load(name)
+
+    def stats(self):
+        """
+        Return cache hits, misses, resident bytes and total decode time.
+        """
+        stats = self.cache.stats()
+        stats['decode time'] = self.decode_time
+        stats['decodes'] = self.decode_count
+        stats['assets'] = len(self.paths)
+
+        return stats
@@ -0,0 +1,245 @@
+"""
+Texture atlases.  Small read-only surfaces (map tiles, sprite frames and
+UI boxes) are packed into a few large display-format pages instead of
+each holding its own allocation.  Packing hands back a Region, an
+(atlas page, source rect) handle that is drawn with an area blit.
+"""
+import pygame as pg
+from . import cache
+
+# page kinds, fastest to slowest to blit from
+OPAQUE = 'opaque'
+COLORKEY = 'colorkey'
+ALPHA = 'alpha'
+
+
+def surface_kind(surface):
+    """
+    Return the kind of page a surface can be packed into.  Colorkeyed
+    surfaces share pages with the same colorkey.  Surfaces with no
+    transparent pixels go on plain display-format pages, and the rest
+    on per-pixel alpha pages.
+    """
+    colorkey = surface.get_colorkey()
+    if not surface.get_flags() & pg.SRCALPHA:
+        if colorkey is not None:
+            return COLORKEY, tuple(colorkey)
+        return OPAQUE, None
+
+    width, height = surface.get_size()
+    if pg.mask.from_surface(surface, 254).count() == width * height:
+        return OPAQUE, None
+    return ALPHA, None
+
+
+class Region(object):
+    """
+    A packed surface: the page it lives on and its rect within it.
+    """
+    def __init__(self, surface, rect):
+        self.surface = surface
+        self.rect = rect
+        if rect == surface.get_rect():
+            self.image = surface
+        else:
+            self.image = surface.subsurface(rect)
+
+    def get_size(self):
+        return self.rect.size
+
+    def get_rect(self, **kwargs):
+        """
+        Same as Surface.get_rect for the packed surface.
+        """
+        rect = pg.Rect((0, 0), self.rect.size)
+        for attribute, value in kwargs.items():
+            setattr(rect, attribute, value)
+        return rect
+
+    def draw(self, destination, position):
+        """
+        Draw the region onto destination at position.
+        """
+        return destination.blit(self.surface, position, self.rect)
+
+
+class Atlas(object):
+    """
+    One atlas page.  Surfaces are packed on shelves.  A new surface goes
+    on the lowest shelf that is not much taller than it, then on a new
+    shelf below the others, then on any shelf it fits on.
+    """
+    def __init__(self, size, kind, colorkey=None):
+        self.size = size
+        self.kind = kind
+        self.colorkey = colorkey
+        self.surface = self.make_surface()
+        self.shelves = []
+        self.used_area = 0
+
+    def make_surface(self):
+        """
+        Make the page in the display format for its kind.
+        """
+        if self.kind == ALPHA:
+            surface = pg.Surface(self.size, pg.SRCALPHA).convert_alpha()
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface = pg.Surface(self.size).convert()
+            if self.kind == COLORKEY:
+                surface.fill(self.colorkey)
+                surface.set_colorkey(self.colorkey)
+
+        return surface
+
+    def find_space(self, width, height):
+        """
+        Return the top left corner of a free area of the given size,
+        or None if the page is full.
+        """
+        page_width, page_height = self.size
+        if width > page_width:
+            return None
+
+        fits = [shelf for shelf in self.shelves
+                if height <= shelf[1] and shelf[2] + width <= page_width]
+        close_fits = [shelf for shelf in fits if shelf[1] <= height * 3 // 2]
+
+        if self.shelves:
+            top = self.shelves[-1][0] + self.shelves[-1][1]
+        else:
+            top = 0
+
+        if close_fits:
+            shelf = min(close_fits, key=lambda shelf: shelf[1])
+        elif top + height <= page_height:
+            self.shelves.append([top, height, 0])
+            shelf = self.shelves[-1]
+        elif fits:
+            shelf = min(fits, key=lambda shelf: shelf[1])
+        else:
+            return None
+
+        position = shelf[2], shelf[0]
+        shelf[2] += width
+        return position
+
+    def add(self, surface):
+        """
+        Copy surface onto the page.  Return its Region, or None if there
+        is no room left.
+        """
+        width, height = surface.get_size()
+        position = self.find_space(width, height)
+        if position is None:
+            return None
+
+        rect = pg.Rect(position, (width, height))
+        if self.kind == ALPHA:
+            #The page is transparent black, so this copies the pixels as is.
+            #Opaque surfaces come out with an alpha of 255.
+            self.surface.blit(surface, rect, special_flags=pg.BLEND_RGBA_MAX)
+        else:
+            source = surface.copy()
+            source.set_colorkey(None)
+            self.surface.blit(source, rect)
+        self.used_area += width * height
+
+        return Region(self.surface, rect)
+
+    def fill_ratio(self):
+        """
+        Return the fraction of the page covered by packed surfaces.
+        """
+        return self.used_area / float(self.size[0] * self.size[1])
+
+
+class AtlasSet(object):
+    """
+    All atlas pages, keyed so that each surface is only packed once.
+    Surfaces bigger than a quarter of a page would leave most of their
+    page empty, so they are kept as they are.  So are RLE accelerated
+    surfaces: an RLE page has no pixels left for subsurfaces to view,
+    and an area blit from it decodes every row above the area first.
+    """
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.max_area = page_size[0] * page_size[1] // 4
+        self.pages = {}
+        self.regions = {}
+        self.source_bytes = 0
+        self.unpacked = 0
+
+    def __contains__(self, key):
+        return key in self.regions
+
+    def get(self, key):
+        return self.regions.get(key)
+
+    def add(self, key, surface):
+        """
+        Pack surface under key and return its Region.  A surface that
+        was already packed under the same key is not copied again.
+        """
+        region = self.regions.get(key)
+        if region is not None:
+            return region
+
+        width, height = surface.get_size()
+        region = None
+        if (width * height <= self.max_area and width <= self.page_size[0]
+                and height <= self.page_size[1]
+                and not surface.get_flags() & pg.RLEACCELOK):
+            kind = surface_kind(surface)
+            pages = self.pages.setdefault(kind, [])
+            for page in pages:
+                region = page.add(surface)
+                if region:
+                    break
+            else:
+                page = Atlas(self.page_size, *kind)
+                pages.append(page)
+                region = page.add(surface)
+
+        if region is None:
+            region = Region(surface, surface.get_rect())
+            self.unpacked += 1
+        else:
+            self.source_bytes += cache.surface_bytes(surface)
+
+        self.regions[key] = region
+        return region
+
+    def stats(self):
+        """
+        Return how full the pages are and how much memory they save
+        compared with keeping every packed surface separately.
+        """
+        pages = [page for kind in self.pages for page in self.pages[kind]]
+        atlas_bytes = sum(cache.surface_bytes(page.surface) for page in pages)
+        page_area = self.page_size[0] * self.page_size[1] * len(pages)
+        used_area = sum(page.used_area for page in pages)
+
+        return {'pages': len(pages),
+                'regions': len(self.regions),
+                'unpacked': self.unpacked,
+                'fill': used_area / float(page_area) if page_area else 0.0,
+                'atlas bytes': atlas_bytes,
+                'source bytes': self.source_bytes,
+                'saved bytes': self.source_bytes - atlas_bytes}
+
+
+class AtlasImages(object):
+    """
+    Read-only view of an AssetRegistry whose images are packed into
+    atlases the first time they are used.  Used for the UI boxes.
+    """
+    def __init__(self, registry, atlases):
+        self.registry = registry
+        self.atlases = atlases
+
+    def __getitem__(self, name):
+        region = self.atlases.get(('gfx', name))
+        if region is None:
+            region = self.atlases.add(('gfx', name), self.registry[name])
+        return region
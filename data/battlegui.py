@@ -20,9 +20,8 @@ class InfoBox(object):
         self.enemy_damage = 0
         self.player_damage = 0
         self.state = c.SELECT_ACTION
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
-        self.title_font.set_underline(True)
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 18)
+        self.title_font = setup.FONT_POOL.get(c.MAIN_FONT, 22, underline=True)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 18)
         self.experience_points = experience
         self.gold_earned = gold
         self.state_dict = self.make_state_dict()
@@ -106,12 +105,12 @@ class InfoBox(object):
             if i == 0:
                 x = 195
                 y = 10
-                surface = self.title_font.render(text, True, c.NEAR_BLACK)
+                surface = setup.TEXT.render(self.title_font, text, True, c.NEAR_BLACK)
                 rect = surface.get_rect(x=x, y=y)
             else:
                 x = 100
                 y = (i * 30) + 20
-                surface = self.font.render(text, True, c.NEAR_BLACK)
+                surface = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK)
                 rect = surface.get_rect(x=x, y=y)
             sprite.image = surface
             sprite.rect = rect
@@ -123,11 +122,11 @@ class InfoBox(object):
         """
         Make image out of box and message.
         """
-        image = setup.GFX['shopbox']
+        image = setup.UI['shopbox']
         rect = image.get_rect(bottom=608)
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
+        image.draw(surface, (0, 0))
 
         if self.state == c.SELECT_ITEM:
             text_sprites = self.make_text_sprites(self.make_item_text())
@@ -136,7 +135,7 @@ class InfoBox(object):
             text_sprites = self.make_text_sprites(self.make_magic_text())
             text_sprites.draw(surface)
         else:
-            text_surface = self.font.render(self.state_dict[self.state], True, c.NEAR_BLACK)
+            text_surface = setup.TEXT.render(self.font, self.state_dict[self.state], True, c.NEAR_BLACK)
             text_rect = text_surface.get_rect(x=50, y=50)
             surface.blit(text_surface, text_rect)
 
@@ -194,7 +193,7 @@ class SelectBox(object):
     Box to select whether to attack, use item, use magic or run away.
     """
     def __init__(self):
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.slots = self.make_slots()
         self.image = self.make_image()
         self.rect = self.image.get_rect(bottom=608,
@@ -204,14 +203,14 @@ class SelectBox(object):
         """
         Make the box image for
         """
-        image = setup.GFX['goldbox']
+        image = setup.UI['goldbox']
         rect = image.get_rect(bottom=608)
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
+        image.draw(surface, (0, 0))
 
         for text in self.slots:
-            text_surface = self.font.render(text, True, c.NEAR_BLACK)
+            text_surface = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_surface.get_rect(x=self.slots[text]['x'],
                                               y=self.slots[text]['y'])
             surface.blit(text_surface, text_rect)
@@ -236,7 +235,7 @@ class SelectArrow(object):
     """Small arrow for menu"""
     def __init__(self, enemy_pos_list, info_box):
         self.info_box = info_box
-        self.image = setup.GFX['smallarrow']
+        self.image = setup.UI['smallarrow'].image
         self.rect = self.image.get_rect()
         self.state = 'select action'
         self.state_dict = self.make_state_dict()
@@ -403,7 +402,7 @@ class SelectArrow(object):
         """
         Update arrow position.
         """
-        self.image = setup.GFX['smallarrow']
+        self.image = setup.UI['smallarrow'].image
         state_function = self.state_dict[self.state]
         state_function(keys)
 
@@ -427,7 +426,7 @@ class PlayerHealth(object):
     def __init__(self, select_box_rect, game_data):
         self.health_stats = game_data['player stats']['health']
         self.magic_stats = game_data['player stats']['magic']
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.title_font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.posx = select_box_rect.centerx
         self.posy = select_box_rect.y - 5
 
@@ -445,7 +444,7 @@ class PlayerHealth(object):
         else:
             buffer = ''
         health_string = "Health: {}{}/{}".format(buffer, current_health, max_health)
-        health_surface =  self.title_font.render(health_string, True, c.NEAR_BLACK)
+        health_surface =  setup.TEXT.render(self.title_font, health_string, True, c.NEAR_BLACK)
         health_rect = health_surface.get_rect(x=20, y=9)
 
         current_magic = str(self.magic_stats['current'])
@@ -457,14 +456,14 @@ class PlayerHealth(object):
             buffer = ''
         max_magic = str(self.magic_stats['maximum'])
         magic_string = "Magic:  {}{}/{}".format(buffer, current_magic, max_magic)
-        magic_surface = self.title_font.render(magic_string, True, c.NEAR_BLACK)
+        magic_surface = setup.TEXT.render(self.title_font, magic_string, True, c.NEAR_BLACK)
         magic_rect = magic_surface.get_rect(x=20, top=health_rect.bottom)
 
-        box_surface = setup.GFX['battlestatbox']
+        box_surface = setup.UI['battlestatbox']
         box_rect = box_surface.get_rect()
 
         parent_surface = pg.Surface(box_rect.size)
-        parent_surface.blit(box_surface, box_rect)
+        box_surface.draw(parent_surface, box_rect)
         parent_surface.blit(health_surface, health_rect)
         parent_surface.blit(magic_surface, magic_rect)
 
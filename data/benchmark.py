@@ -0,0 +1,256 @@
+"""
+Benchmarks for the game's loading and rendering code.  Run with:
+
+    python -m data.benchmark assets --workers 4
+    python -m data.benchmark tiles
+    python -m data.benchmark blockers
+    python -m data.benchmark formats
+"""
+import argparse, os
+import pygame as pg
+from . import setup, tools, pytmx, tilerender
+from .pytmx import tmxloader
+from . import constants as c
+from .cache import timer
+
+
+def time_call(function, *args, **kwargs):
+    """
+    Return the wall clock time taken by one call of function.
+    """
+    start = timer()
+    function(*args, **kwargs)
+    return timer() - start
+
+
+def asset_loading(workers, repeat=3):
+    """
+    Compare serial and thread pool loading of every image and sound.
+    The best of several runs is reported for each mode.
+    """
+    graphics = os.path.join('resources', 'graphics')
+    sound = os.path.join('resources', 'sound')
+    loaders = [('gfx', tools.load_all_gfx, graphics),
+               ('sfx', tools.load_all_sfx, sound)]
+    report = {}
+
+    for name, loader, directory in loaders:
+        serial = min(time_call(loader, directory)
+                     for i in range(repeat))
+        threaded = min(time_call(loader, directory, workers=workers)
+                       for i in range(repeat))
+        report[name] = {'serial': serial,
+                        'threaded': threaded,
+                        'workers': workers,
+                        'speedup': serial / threaded if threaded else 0.0}
+
+    return report
+
+
+def print_asset_loading(report):
+    print('{:<6}{:>12}{:>12}{:>10}'.format('', 'serial', 'threaded', 'speedup'))
+    for name in sorted(report):
+        row = report[name]
+        print('{:<6}{:>10.1f}ms{:>10.1f}ms{:>9.2f}x'.format(
+            name, row['serial'] * 1000, row['threaded'] * 1000, row['speedup']))
+
+
+def render_per_tile(tmx_data, surface):
+    """
+    The old map renderer: look up and blit every cell of every layer.
+    """
+    tw = tmx_data.tilewidth
+    th = tmx_data.tileheight
+    gt = tmx_data.getTileImageByGid
+
+    if tmx_data.background_color:
+        surface.fill(tmx_data.background_color)
+
+    for layer in tmx_data.visibleLayers:
+        if isinstance(layer, pytmx.TiledLayer):
+            for x, y, gid in layer:
+                tile = gt(gid)
+                if tile:
+                    surface.blit(tile, (x * tw, y * th))
+
+        elif isinstance(layer, pytmx.TiledImageLayer):
+            image = gt(layer.gid)
+            if image:
+                surface.blit(image, (0, 0))
+
+
+def tile_rendering(repeat=10):
+    """
+    Compare the per-tile loop with one Surface.blits call per layer
+    for every map.  Building the blit sequences is timed separately.
+    """
+    report = {}
+
+    for name in sorted(setup.TMX):
+        renderer = tilerender.Renderer(setup.TMX[name])
+        surface = pg.Surface(renderer.size)
+        per_tile = min(time_call(render_per_tile, renderer.tmx_data, surface)
+                       for i in range(repeat))
+        prepare = time_call(renderer.render, surface)
+        batched = min(time_call(renderer.render, surface)
+                      for i in range(repeat))
+        report[name] = {'per tile': per_tile,
+                        'prepare': prepare - batched,
+                        'batched': batched,
+                        'speedup': per_tile / batched if batched else 0.0}
+
+    return report
+
+
+def print_tile_rendering(report):
+    print('{:<14}{:>12}{:>12}{:>12}{:>10}'.format(
+        '', 'per tile', 'batched', 'prepare', 'speedup'))
+    for name in sorted(report):
+        row = report[name]
+        print('{:<14}{:>10.2f}ms{:>10.2f}ms{:>10.2f}ms{:>9.2f}x'.format(
+            name, row['per tile'] * 1000, row['batched'] * 1000,
+            row['prepare'] * 1000, row['speedup']))
+
+
+def blocker_merging(repeat=10):
+    """
+    Count the blocker rects of every map before and after merging, as
+    LevelState.make_blockers builds them.
+    """
+    report = {}
+
+    for name in sorted(setup.TMX):
+        tmx_data = tilerender.Renderer(setup.TMX[name]).tmx_data
+        blockers = [pg.Rect(each.x * 2, each.y * 2 - 32, 32, 32)
+                    for each in tmx_data.getObjectsByName('blocker')]
+        merged = pytmx.merge_rects(blockers, 32, 32)
+        seconds = min(time_call(pytmx.merge_rects, blockers, 32, 32)
+                      for i in range(repeat))
+        report[name] = {'tiles': len(blockers),
+                        'merged': len(merged),
+                        'saved': len(blockers) - len(merged),
+                        'seconds': seconds}
+
+    return report
+
+
+def print_blocker_merging(report):
+    print('{:<14}{:>8}{:>8}{:>8}{:>10}'.format(
+        '', 'tiles', 'merged', 'saved', 'time'))
+    for name in sorted(report):
+        row = report[name]
+        print('{:<14}{:>8}{:>8}{:>8}{:>8.2f}ms'.format(
+            name, row['tiles'], row['merged'], row['saved'],
+            row['seconds'] * 1000))
+
+
+FORMATS = tmxloader.OPAQUE, tmxloader.COLORKEY, tmxloader.ALPHA
+
+
+def format_blits(tmx_data):
+    """
+    Return the blits Renderer.render makes for the map's tiles, as
+    (atlas page, position, area) sequences keyed by tile format, and
+    the same tiles as standalone surfaces in the format they had
+    before tiles were classified: opaque tiles convert()ed and every
+    other tile with perpixel alpha.
+    """
+    tw = tmx_data.tilewidth
+    th = tmx_data.tileheight
+    blits = dict((each, []) for each in FORMATS)
+    standalone = []
+    unclassified = {}
+
+    for layer in tmx_data.visibleTileLayers:
+        for x, y, gid in layer:
+            tile_format = tmx_data.formats[gid] if gid else None
+            if not tile_format:
+                continue
+
+            region = tmx_data.regions[gid]
+            position = x * tw, y * th
+            blits[tile_format].append((region.surface, position, region.rect))
+
+            tile = unclassified.get(gid)
+            if tile is None:
+                if tile_format == tmxloader.OPAQUE:
+                    tile = region.image.convert()
+                else:
+                    tile = region.image.convert_alpha()
+                unclassified[gid] = tile
+            standalone.append((tile, position))
+
+    return blits, standalone
+
+
+def tile_formats(repeat=5):
+    """
+    Count the drawn tiles of each format in every map and time their
+    blits from the atlas pages, as the renderer draws them.  These are
+    compared with drawing every tile that has any transparency from a
+    standalone surface with perpixel alpha.
+    """
+    report = {}
+
+    for name in sorted(setup.TMX):
+        renderer = tilerender.Renderer(setup.TMX[name])
+        target = pg.Surface(renderer.size)
+        blits, standalone = format_blits(renderer.tmx_data)
+
+        seconds = dict((each, min(time_call(target.blits, blits[each], 0)
+                                  for i in range(repeat)))
+                       for each in FORMATS)
+        report[name] = {'counts': dict((each, len(blits[each])) for each in FORMATS),
+                        'costs': dict((each, seconds[each] / len(blits[each]))
+                                      for each in FORMATS if blits[each]),
+                        'before': min(time_call(target.blits, standalone, 0)
+                                      for i in range(repeat)),
+                        'after': sum(seconds.values())}
+
+    return report
+
+
+def print_tile_formats(report):
+    print('{:<14}{:>8}{:>10}{:>8}{:>12}{:>12}'.format(
+        '', 'opaque', 'colorkey', 'alpha', 'all alpha', 'atlas'))
+    for name in sorted(report):
+        row = report[name]
+        counts = row['counts']
+        print('{:<14}{:>8}{:>10}{:>8}{:>10.3f}ms{:>10.3f}ms'.format(
+            name, counts[tmxloader.OPAQUE], counts[tmxloader.COLORKEY],
+            counts[tmxloader.ALPHA], row['before'] * 1000, row['after'] * 1000))
+        print('  per tile: ' + ', '.join(
+            '{0} {1:.2f}us'.format(each, row['costs'][each] * 1e6)
+            for each in FORMATS if each in row['costs']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run game benchmarks.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+
+    assets = subparsers.add_parser('assets', help='serial vs threaded asset loading')
+    assets.add_argument('--workers', type=int, default=c.LOAD_WORKERS)
+    assets.add_argument('--repeat', type=int, default=3)
+
+    tiles = subparsers.add_parser('tiles', help='per-tile vs batched map rendering')
+    tiles.add_argument('--repeat', type=int, default=10)
+
+    blockers = subparsers.add_parser('blockers', help='blocker rects saved by merging')
+    blockers.add_argument('--repeat', type=int, default=10)
+
+    subparsers.add_parser('formats', help='tile formats and their atlas blit costs')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'assets':
+        print_asset_loading(asset_loading(args.workers, args.repeat))
+    elif args.benchmark == 'tiles':
+        print_tile_rendering(tile_rendering(args.repeat))
+    elif args.benchmark == 'blockers':
+        print_blocker_merging(blocker_merging(args.repeat))
+    elif args.benchmark == 'formats':
+        print_tile_formats(tile_formats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""
+Packed resource bundle.  All images, sound effects and tmx maps are
+stored in a single indexed file: images as pre-decoded pixel buffers,
+sounds as raw mixer samples and maps as their original bytes.  At
+runtime the bundle is memory mapped and surfaces are created straight
+from the mapped buffers, so no file is opened or decoded per asset.
+
+The index doubles as a content-hash manifest.  If any source file has
+changed since the bundle was built, load_bundle() returns None and the
+game falls back to the loose files.
+
+Build the bundle with:
+
+    python -m data.bundle
+
+and add --verify to check that every map renders the same from the
+bundle as from the loose files.
+"""
+import argparse, hashlib, io, json, mmap, os, struct, sys
+import pygame as pg
+from . import tools, pytmx
+from . import constants as c
+
+#Python 2/3 compatibility.
+if sys.version_info[0] == 2:
+    def view(mapped, offset, length):
+        return buffer(mapped, offset, length)
+else:
+    def view(mapped, offset, length):
+        return memoryview(mapped)[offset:offset + length]
+
+
+MAGIC = b'STOLENCROWN-BUNDLE-2\n'
+HEADER_SIZE = struct.Struct('<Q')
+ALIGNMENT = 16
+
+IMAGE = 'image'
+SOUND = 'sound'
+TMX = 'tmx'
+
+SOURCE_DIRECTORIES = {IMAGE: ('graphics', ('.png', '.jpg', '.bmp')),
+                      SOUND: ('sound', ('.wav', '.mp3', '.ogg', '.mdi')),
+                      TMX: ('tmx', ('.tmx',))}
+
+
+def file_hash(path):
+    """
+    Return the sha1 hex digest of a file's contents.
+    """
+    with open(path, 'rb') as source:
+        return hashlib.sha1(source.read()).hexdigest()
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class Bundle(object):
+    """
+    A memory mapped resource bundle.
+    """
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.entries, self.mixer, self.data_start = self.read_index()
+
+    def read_index(self):
+        """
+        Read the json index that follows the magic number.
+        """
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError('{} is not a resource bundle'.format(self.path))
+
+        start = len(MAGIC)
+        header_length = HEADER_SIZE.unpack(
+            self.map[start:start + HEADER_SIZE.size])[0]
+        start += HEADER_SIZE.size
+        header = json.loads(self.map[start:start + header_length].decode('utf-8'))
+        data_start = align(start + header_length)
+
+        return header['entries'], header['mixer'], data_start
+
+    def key(self, path):
+        """
+        Turn a file path into the bundle's key for it.
+        """
+        relative = os.path.relpath(os.path.normpath(path), self.root)
+        return relative.replace(os.sep, '/')
+
+    def __contains__(self, path):
+        return self.key(path) in self.entries
+
+    def is_stale(self):
+        """
+        Check every source file against the manifest.  Files whose size
+        and mtime are unchanged are trusted, the rest are re-hashed.
+        """
+        for key, entry in self.entries.items():
+            source = os.path.join(self.root, key)
+            try:
+                stat = os.stat(source)
+            except OSError:
+                return True
+            if (stat.st_size == entry['source size'] and
+                    int(stat.st_mtime) == entry['mtime']):
+                continue
+            if file_hash(source) != entry['sha1']:
+                return True
+
+        return False
+
+    def data(self, entry):
+        """
+        Return a zero-copy view of an entry's bytes.
+        """
+        return view(self.map, self.data_start + entry['offset'], entry['length'])
+
+    def load_surface(self, path):
+        """
+        Return an unconverted surface whose pixels live in the mapped file,
+        with the colorkey the source image had.
+        """
+        entry = self.entries.get(self.key(path))
+        if entry is None:
+            return pg.image.load(path)
+        surface = pg.image.frombuffer(self.data(entry),
+                                      tuple(entry['size']),
+                                      str(entry['format']))
+        if entry['colorkey'] is not None:
+            surface.set_colorkey(entry['colorkey'])
+        return surface
+
+    def load_gfx(self, path, colorkey=(255,0,255)):
+        """
+        Drop-in replacement for tools.load_gfx.
+        """
+        return tools.convert_gfx(self.load_surface(path), colorkey)
+
+    def load_sfx(self, path):
+        """
+        Drop-in replacement for tools.load_sfx.  Samples are only used if
+        the mixer was opened with the settings the bundle was built with.
+        """
+        entry = self.entries.get(self.key(path))
+        if entry is None or list(pg.mixer.get_init() or ()) != self.mixer:
+            return tools.load_sfx(path)
+        return pg.mixer.Sound(buffer=self.data(entry))
+
+    def open(self, path):
+        """
+        Return a file object with the contents of a bundled tmx file.
+        """
+        entry = self.entries.get(self.key(path))
+        if entry is None:
+            return open(path, 'rb')
+        return io.BytesIO(self.data(entry)[:])
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def load_bundle(path, root):
+    """
+    Return the Bundle at path, or None if it is missing or out of date.
+    """
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        bundle = Bundle(path, root)
+    except ValueError:
+        return None
+
+    if bundle.is_stale():
+        bundle.close()
+        return None
+
+    return bundle
+
+
+def pack_image(path):
+    image = pg.image.load(path)
+    if image.get_alpha():
+        image_format = 'RGBA'
+    else:
+        image_format = 'RGB'
+    colorkey = image.get_colorkey()
+    metadata = {'size': list(image.get_size()),
+                'format': image_format,
+                'colorkey': list(colorkey) if colorkey else None}
+
+    return pg.image.tostring(image, image_format), metadata
+
+
+def pack_sound(path):
+    return pg.mixer.Sound(path).get_raw(), {}
+
+
+def pack_tmx(path):
+    with open(path, 'rb') as source:
+        return source.read(), {}
+
+
+def build(root, output):
+    """
+    Pack everything under root into a bundle file at output.
+    """
+    packers = {IMAGE: pack_image, SOUND: pack_sound, TMX: pack_tmx}
+    entries = {}
+    blobs = []
+    offset = 0
+
+    for kind in sorted(SOURCE_DIRECTORIES):
+        directory, accept = SOURCE_DIRECTORIES[kind]
+        if kind == SOUND and not pg.mixer.get_init():
+            print('Mixer unavailable, sound effects will load from disk.')
+            continue
+
+        for filename in sorted(os.listdir(os.path.join(root, directory))):
+            if os.path.splitext(filename)[1].lower() not in accept:
+                continue
+            source = os.path.join(root, directory, filename)
+            data, entry = packers[kind](source)
+            stat = os.stat(source)
+            entry.update({'kind': kind,
+                          'offset': offset,
+                          'length': len(data),
+                          'sha1': file_hash(source),
+                          'source size': stat.st_size,
+                          'mtime': int(stat.st_mtime)})
+            entries[directory + '/' + filename] = entry
+            blobs.append((offset, data))
+            offset = align(offset + len(data))
+
+    header = json.dumps({'mixer': list(pg.mixer.get_init() or ()),
+                         'entries': entries}, sort_keys=True).encode('utf-8')
+    data_start = align(len(MAGIC) + HEADER_SIZE.size + len(header))
+
+    with open(output, 'wb') as bundle_file:
+        bundle_file.write(MAGIC)
+        bundle_file.write(HEADER_SIZE.pack(len(header)))
+        bundle_file.write(header)
+        for blob_offset, data in blobs:
+            bundle_file.seek(data_start + blob_offset)
+            bundle_file.write(data)
+
+    return len(entries), os.path.getsize(output)
+
+
+def render_map(path, **options):
+    """
+    Load the tmx map at path with options for load_pygame and draw
+    every visible layer, tile by tile, onto a new surface.
+    """
+    tmx_data = pytmx.load_pygame(path, pixelalpha=True, **options)
+    surface = pg.Surface((tmx_data.width * tmx_data.tilewidth,
+                          tmx_data.height * tmx_data.tileheight)).convert()
+    if tmx_data.background_color:
+        surface.fill(tmx_data.background_color)
+
+    for layer in tmx_data.visibleLayers:
+        if isinstance(layer, pytmx.TiledLayer):
+            for x, y, gid in layer:
+                tile = tmx_data.getTileImageByGid(gid)
+                if tile:
+                    surface.blit(tile, (x * tmx_data.tilewidth,
+                                        y * tmx_data.tileheight))
+        elif isinstance(layer, pytmx.TiledImageLayer):
+            image = tmx_data.getTileImageByGid(layer.gid)
+            if image:
+                surface.blit(image, (0, 0))
+
+    return surface
+
+
+def compare_maps(bundle, root):
+    """
+    Render every bundled map from the bundle and from the loose files,
+    and return the number of differing pixels for each.
+    """
+    report = {}
+
+    for key in sorted(bundle.entries):
+        if bundle.entries[key]['kind'] != TMX:
+            continue
+        path = os.path.join(root, key)
+        loose = render_map(path)
+        packed = render_map(path, source=bundle.open(path),
+                            image_loader=bundle.load_surface)
+        if loose.get_size() != packed.get_size():
+            report[key] = loose.get_width() * loose.get_height()
+            continue
+        loose_pixels = pg.image.tostring(loose, 'RGB')
+        packed_pixels = pg.image.tostring(packed, 'RGB')
+        report[key] = sum(loose_pixels[i:i + 3] != packed_pixels[i:i + 3]
+                          for i in range(0, len(loose_pixels), 3))
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the resource bundle.')
+    parser.add_argument('--root', default='resources',
+                        help='resource directory to pack')
+    parser.add_argument('--output', default=c.BUNDLE_PATH,
+                        help='bundle file to write')
+    parser.add_argument('--verify', action='store_true',
+                        help='check that maps render the same from the bundle')
+    args = parser.parse_args()
+
+    pg.init()
+    count, size = build(args.root, args.output)
+    print('Packed {} assets into {} ({} bytes).'.format(count, args.output, size))
+
+    if args.verify:
+        pg.display.set_mode((1, 1))
+        bundle = Bundle(args.output, args.root)
+        report = compare_maps(bundle, args.root)
+        bundle.close()
+        for key in sorted(report):
+            print('{:<28}{:>8} differing pixels'.format(key, report[key]))
+        if any(report.values()):
+            sys.exit(1)
+
+    pg.quit()
+
+
+if __name__ == '__main__':
+    main()
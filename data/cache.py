@@ -0,0 +1,153 @@
+"""
+Size-bounded least recently used caches.  Used to hold decoded
+resources (images, sounds, rendered text, map surfaces) so that memory
+use scales with what the current scene needs instead of with everything
+the game has ever loaded.
+"""
+import sys, time
+from collections import OrderedDict
+import pygame as pg
+
+#Python 2/3 compatibility.
+if sys.version_info[0] == 2:
+    timer = time.time
+else:
+    timer = time.perf_counter
+
+
+def surface_bytes(surface):
+    """
+    Return the number of bytes of pixel data held by a surface.
+    """
+    return surface.get_pitch() * surface.get_height()
+
+
+def sound_bytes(sound):
+    """
+    Return the number of bytes of sample data held by a Sound.
+    """
+    mixer_settings = pg.mixer.get_init()
+    if not mixer_settings:
+        return 0
+    frequency, size, channels = mixer_settings
+    return int(sound.get_length() * frequency * channels * (abs(size) // 8))
+
+
+def value_bytes(value):
+    """
+    Size function for the kinds of values the game caches.
+    """
+    if isinstance(value, pg.Surface):
+        return surface_bytes(value)
+    elif isinstance(value, pg.mixer.SoundType):
+        return sound_bytes(value)
+    else:
+        return 0
+
+
+class LRUCache(object):
+    """
+    Dictionary-like cache that evicts the least recently used entries
+    once the total size of its values goes over max_bytes.  A max_bytes
+    of None means the cache is never trimmed.  Pinned keys are never
+    evicted.
+    """
+    def __init__(self, max_bytes=None, sizeof=value_bytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.pinned = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """
+        Return the value for key and mark it as most recently used.
+        """
+        try:
+            value, size = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.entries[key] = value, size
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Add a value to the cache, evicting old entries as needed.
+        """
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+
+        size = self.sizeof(value)
+        self.entries[key] = value, size
+        self.bytes += size
+        self.trim()
+
+        return value
+
+    def discard(self, key):
+        """
+        Remove key from the cache if it is present.
+        """
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
+
+    def pin(self, key):
+        """
+        Keep key from being evicted until it is unpinned.  The key does
+        not have to be in the cache yet.
+        """
+        self.pinned.add(key)
+
+    def unpin(self, key):
+        self.pinned.discard(key)
+
+    def trim(self):
+        """
+        Evict least recently used entries until the cache is within budget.
+        The most recent entry is always kept, even if it alone is too big.
+        """
+        if self.max_bytes is None:
+            return
+
+        for key in list(self.entries)[:-1]:
+            if self.bytes <= self.max_bytes:
+                break
+            if key in self.pinned:
+                continue
+            value, size = self.entries.pop(key)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        Return a dictionary describing cache usage.
+        """
+        lookups = self.hits + self.misses
+        if lookups:
+            hit_rate = self.hits / float(lookups)
+        else:
+            hit_rate = 0.0
+
+        return {'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit rate': hit_rate,
+                'evictions': self.evictions}
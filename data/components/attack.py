@@ -15,8 +15,7 @@ class Fire(pg.sprite.Sprite):
     """
     def __init__(self, x, y):
         super(Fire, self).__init__()
-        self.spritesheet = setup.GFX['explosion']
-        self.get_image = tools.get_image
+        self.get_frame = setup.FRAMES.get
         self.image_list = self.make_image_list()
         self.index = 0
         self.image = self.image_list[self.index]
@@ -34,8 +33,7 @@ class Fire(pg.sprite.Sprite):
             for column in range(8):
                 posx = column * 128
                 posy = row * 128
-                new_image = self.get_image(posx, posy, 128, 128,
-                                           self.spritesheet)
+                new_image = self.get_frame('explosion', posx, posy, 128, 128)
                 image_list.append(new_image)
 
         return image_list
@@ -13,7 +13,6 @@ class Sword(object):
     """
     def __init__(self, player):
         self.player = player
-        self.sprite_sheet = setup.GFX['shopsigns']
         self.image_list = self.make_image_list()
         self.index = 0
         self.timer = 0.0
@@ -22,14 +21,14 @@ class Sword(object):
         """
         Make the list of two images for animation.
         """
-        image_list = [tools.get_image(48, 0, 16, 16, self.sprite_sheet),
-                      tools.get_image(0, 0, 22, 16, setup.GFX['sword2'])]
+        image_list = [setup.FRAMES.get('shopsigns', 48, 0, 16, 16),
+                      setup.FRAMES.get('sword2', 0, 0, 22, 16)]
         return image_list
 
     @property
     def image(self):
         new_image = self.image_list[self.index]
-        return pg.transform.scale2x(new_image)
+        return setup.FRAMES.scale2x(new_image)
 
     @property
     def rect(self):
@@ -62,7 +61,7 @@ class HealthPoints(pg.sprite.Sprite):
         super(HealthPoints, self).__init__()
         self.ether = ether
         self.damage = damage
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 27)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 27)
         self.text_image = self.make_surface(points)
         self.rect = self.text_image.get_rect(x=topleft_pos[0]+20,
                                              bottom=topleft_pos[1]+10)
@@ -82,16 +81,16 @@ class HealthPoints(pg.sprite.Sprite):
         if self.damage:
             if points > 0:
                 text = "-{}".format(str(points))
-                surface = self.font.render(text, True, c.RED)
+                surface = setup.TEXT.render(self.font, text, True, c.RED)
                 return surface
             else:
-                return self.font.render('Miss', True, c.WHITE).convert_alpha()
+                return setup.TEXT.render(self.font, 'Miss', True, c.WHITE).convert_alpha()
         else:
             text = "+{}".format(str(points))
             if self.ether:
-                surface = self.font.render(text, True, c.PINK)
+                surface = setup.TEXT.render(self.font, text, True, c.PINK)
             else:
-                surface = self.font.render(text, True, c.GREEN)
+                surface = setup.TEXT.render(self.font, text, True, c.GREEN)
 
             return surface
 
@@ -109,10 +108,7 @@ class HealthPoints(pg.sprite.Sprite):
         Fade score in and out.
         """
         if self.fade_out:
-            self.image = pg.Surface(self.rect.size).convert()
-            self.image.set_colorkey(c.BLACK)
             self.image.set_alpha(self.alpha)
-            self.image.blit(self.text_image, (0, 0))
             self.alpha -= 15
             if self.alpha <= 0:
                 self.kill()
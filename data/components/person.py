@@ -18,7 +18,8 @@ class Person(pg.sprite.Sprite):
         super(Person, self).__init__()
         self.alpha = 255
         self.name = sheet_key
-        self.get_image = setup.tools.get_image
+        self.get_frame = setup.FRAMES.get
+        self.scale2x = setup.FRAMES.scale2x
         self.spritesheet_dict = self.create_spritesheet_dict(sheet_key)
         self.animation_dict = self.create_animation_dict()
         self.index = index
@@ -43,16 +44,17 @@ class Person(pg.sprite.Sprite):
         self.wander_box = self.make_wander_box()
         self.observers = [observer.SoundEffects()]
         self.health = 0
-        self.death_image = pg.transform.scale2x(self.image)
+        self.death_image = self.scale2x(self.image)
+        self.fade_image = None
         self.battle = None
 
     def create_spritesheet_dict(self, sheet_key):
         """
-        Make a dictionary of images from sprite sheet.
+        Make a dictionary of images from sprite sheet.  The frames are
+        shared with every other sprite using the same sheet.
         """
         image_list = []
         image_dict = {}
-        sheet = setup.GFX[sheet_key]
 
         image_keys = ['facing up 1', 'facing up 2',
                       'facing down 1', 'facing down 2',
@@ -62,7 +64,7 @@ class Person(pg.sprite.Sprite):
         for row in range(2):
             for column in range(4):
                 image_list.append(
-                    self.get_image(column*32, row*32, 32, 32, sheet))
+                    self.get_frame(sheet_key, column*32, row*32, 32, 32))
 
         for key, image in izip(image_keys, image_list):
             image_dict[key] = image
@@ -342,7 +344,7 @@ class Person(pg.sprite.Sprite):
 
         if self.x_vel == FAST_FORWARD:
             self.image = self.spritesheet_dict['facing left 1']
-            self.image = pg.transform.scale2x(self.image)
+            self.image = self.scale2x(self.image)
             if self.rect.x <= self.origin_pos[0] - 110:
                 self.x_vel = FAST_BACK
                 self.notify(c.ENEMY_DAMAGED)
@@ -352,7 +354,7 @@ class Person(pg.sprite.Sprite):
                 self.x_vel = 0
                 self.state = 'battle resting'
                 self.image = self.spritesheet_dict['facing left 2']
-                self.image = pg.transform.scale2x(self.image)
+                self.image = self.scale2x(self.image)
                 self.notify(c.PLAYER_FINISHED_ATTACK)
 
     def enter_enemy_attack_state(self):
@@ -425,7 +427,7 @@ class Person(pg.sprite.Sprite):
         self.small_image_list = self.animation_dict[self.direction]
         self.image_list = []
         for image in self.small_image_list:
-            self.image_list.append(pg.transform.scale2x(image))
+            self.image_list.append(self.scale2x(image))
         self.animation()
 
     def victory_dance(self):
@@ -435,7 +437,7 @@ class Person(pg.sprite.Sprite):
         self.small_image_list = self.animation_dict[self.direction]
         self.image_list = []
         for image in self.small_image_list:
-            self.image_list.append(pg.transform.scale2x(image))
+            self.image_list.append(self.scale2x(image))
         self.animation(500)
 
     def knock_back(self):
@@ -463,12 +465,15 @@ class Person(pg.sprite.Sprite):
 
     def fade_death(self):
         """
-        Make character become transparent in death.
+        Make character become transparent in death.  The faded image
+        is built on the first frame; later frames only change its alpha.
         """
-        self.image = pg.Surface((64, 64)).convert()
-        self.image.set_colorkey(c.BLACK)
+        if self.fade_image is None:
+            self.fade_image = pg.Surface((64, 64)).convert()
+            self.fade_image.set_colorkey(c.BLACK)
+            self.fade_image.blit(self.death_image, (0, 0))
+        self.image = self.fade_image
         self.image.set_alpha(self.alpha)
-        self.image.blit(self.death_image, (0, 0))
         self.alpha -= 8
         if self.alpha <= 0:
             self.kill()
@@ -539,8 +544,8 @@ class Player(Person):
         Put a red overlay over sprite to indicate damage.
         """
         if self.damaged:
-            self.image = copy.copy(self.spritesheet_dict['facing left 2'])
-            self.image = pg.transform.scale2x(self.image).convert_alpha()
+            self.image = self.scale2x(self.spritesheet_dict['facing left 2'])
+            self.image = self.image.convert_alpha()
             damage_image = copy.copy(self.image).convert_alpha()
             damage_image.fill((255, 0, 0, self.damage_alpha), special_flags=pg.BLEND_RGBA_MULT)
             self.image.blit(damage_image, (0, 0))
@@ -556,15 +561,15 @@ class Player(Person):
                     self.damaged = False
                     self.fade_in = True
                     self.image = self.spritesheet_dict['facing left 2']
-                    self.image = pg.transform.scale2x(self.image)
+                    self.image = self.scale2x(self.image)
 
     def healing_animation(self):
         """
         Put a green overlay over sprite to indicate healing.
         """
         if self.healing:
-            self.image = copy.copy(self.spritesheet_dict['facing left 2'])
-            self.image = pg.transform.scale2x(self.image).convert_alpha()
+            self.image = self.scale2x(self.spritesheet_dict['facing left 2'])
+            self.image = self.image.convert_alpha()
             healing_image = copy.copy(self.image).convert_alpha()
             healing_image.fill((0, 255, 0, self.healing_alpha), special_flags=pg.BLEND_RGBA_MULT)
             self.image.blit(healing_image, (0, 0))
@@ -580,7 +585,7 @@ class Player(Person):
                     self.healing = False
                     self.fade_in = True
                     self.image = self.spritesheet_dict['facing left 2']
-                    self.image = pg.transform.scale2x(self.image)
+                    self.image = self.scale2x(self.image)
 
     def check_for_input(self):
         """Checks for player input"""
@@ -631,9 +636,8 @@ class Chest(Person):
         """
         Make a dictionary for the sprite's images.
         """
-        sprite_sheet = setup.GFX['treasurechest']
-        image_dict = {'closed': self.get_image(0, 0, 32, 32, sprite_sheet),
-                      'opened': self.get_image(32, 0, 32, 32, sprite_sheet)}
+        image_dict = {'closed': self.get_frame('treasurechest', 0, 0, 32, 32),
+                      'opened': self.get_frame('treasurechest', 32, 0, 32, 32)}
 
         return image_dict
 
@@ -9,7 +9,7 @@ class NextArrow(pg.sprite.Sprite):
     """Flashing arrow indicating more dialogue"""
     def __init__(self):
         super(NextArrow, self).__init__()
-        self.image = setup.GFX['fancyarrow']
+        self.image = setup.UI['fancyarrow'].image
         self.rect = self.image.get_rect(right=780,
                                         bottom=135)
 
@@ -18,10 +18,10 @@ class DialogueBox(object):
     """Text box used for dialogue"""
     def __init__(self, dialogue, index=0, image_key='dialoguebox', item=None):
         self.item = item
-        self.bground = setup.GFX[image_key]
+        self.bground = setup.UI[image_key]
         self.rect = self.bground.get_rect(centerx=400)
         self.arrow_timer = 0.0
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.dialogue_list = dialogue
         self.index = index
         self.image = self.make_dialogue_box_image()
@@ -40,11 +40,12 @@ class DialogueBox(object):
         """
         image = pg.Surface(self.rect.size)
         image.set_colorkey(c.BLACK)
-        image.blit(self.bground, (0, 0))
+        self.bground.draw(image, (0, 0))
 
-        dialogue_image = self.font.render(self.dialogue_list[self.index],
-                                          True,
-                                          c.NEAR_BLACK)
+        dialogue_image = setup.TEXT.render(self.font,
+                                           self.dialogue_list[self.index],
+                                           True,
+                                           c.NEAR_BLACK)
         dialogue_rect = dialogue_image.get_rect(left=50, top=50)
         image.blit(dialogue_image, dialogue_rect)
 
@@ -53,14 +54,8 @@ class DialogueBox(object):
     def update(self, keys, current_time):
         """Updates scrolling text"""
         self.current_time = current_time
-        self.draw_box(current_time)
         self.terminate_check(keys)
 
-    def draw_box(self, current_time, x=400):
-        """Reveal dialogue on textbox"""
-        self.image = self.make_dialogue_box_image()
-        self.check_to_draw_arrow()
-
     def terminate_check(self, keys):
         """Remove textbox from sprite group after 2 seconds"""
         if keys[pg.K_SPACE] and self.allow_input:
@@ -96,3 +96,29 @@ DEATH_TRANSITION_SPEED = 5
 NORMAL = 'normal'
 TRANSITION_IN = 'transition in'
 TRANSITION_OUT = 'transition out'
+
+#ASSET CACHES
+
+BUNDLE_PATH = 'resources/resources.bundle'
+TMX_CACHE_DIR = 'resources/tmx/compiled'
+
+GFX_CACHE_SIZE = 16 * 1024 * 1024
+SFX_CACHE_SIZE = 8 * 1024 * 1024
+TEXT_CACHE_SIZE = 2 * 1024 * 1024
+MAP_CACHE_SIZE = 16 * 1024 * 1024
+MAP_CHUNK_SIZE = 256
+MAP_CHUNK_CACHE_SIZE = 8 * 1024 * 1024
+MUSIC_CACHE_SIZE = 12 * 1024 * 1024
+MUSIC_FADE_TIME = 800
+LOAD_WORKERS = 4
+ATLAS_PAGE_SIZE = 1024, 512
+
+#SIMULATION
+
+SIM_RATE = 60
+SIM_STEP = 1000.0 / SIM_RATE
+MAX_SIM_STEPS = 5
+
+#IDLE MODE
+
+IDLE_TICK = 250
@@ -0,0 +1,38 @@
+"""
+Full screen fade overlays.  Every fade in the game blits a screen sized
+surface of one color with some alpha.  Rather than allocating and
+filling that surface on every frame of every fade, each color is built
+once and shared; drawing a fade only sets its alpha.
+"""
+import pygame as pg
+
+
+class FadeOverlays(object):
+    """
+    One display format overlay surface per color, built the first time
+    that color is faded to.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.overlays = {}
+
+    def get_overlay(self, color):
+        """
+        Return the shared overlay filled with color.
+        """
+        key = tuple(color)
+        overlay = self.overlays.get(key)
+        if overlay is None:
+            overlay = pg.Surface(self.size).convert()
+            overlay.fill(color)
+            self.overlays[key] = overlay
+        return overlay
+
+    def draw(self, surface, color, alpha, position=(0, 0)):
+        """
+        Blit the overlay for color over surface with the given alpha.
+        The overlay is shared, so its alpha is set on every draw.
+        """
+        overlay = self.get_overlay(color)
+        overlay.set_alpha(alpha)
+        surface.blit(overlay, position)
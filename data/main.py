@@ -1,6 +1,8 @@
 from data.states import shop, levels, battle, main_menu, death
 from data.states import credits
-from . import setup, tools
+from functools import partial
+import pygame as pg
+from . import setup, tools, profiler
 from . import constants as c
 
 
@@ -28,31 +30,58 @@ LOADGAME = 'load game'
 CREDITS = 'credits'
 
 
-def main():
-    """Add states to control here"""
-    run_it = tools.Control(setup.ORIGINAL_CAPTION)
-    state_dict = {MAIN_MENU: main_menu.Menu(),
-                  TOWN: levels.LevelState(TOWN),
-                  CASTLE: levels.LevelState(CASTLE),
-                  HOUSE: levels.LevelState(HOUSE),
-                  OVERWORLD: levels.LevelState(OVERWORLD, True),
-                  BROTHER_HOUSE: levels.LevelState(BROTHER_HOUSE),
-                  INN: shop.Inn(),
-                  ARMOR_SHOP: shop.ArmorShop(),
-                  WEAPON_SHOP: shop.WeaponShop(),
-                  MAGIC_SHOP: shop.MagicShop(),
-                  POTION_SHOP: shop.PotionShop(),
-                  BATTLE: battle.Battle(),
-                  DUNGEON: levels.LevelState(DUNGEON, True),
-                  DUNGEON2: levels.LevelState(DUNGEON2, True),
-                  DUNGEON3: levels.LevelState(DUNGEON3, True),
-                  DUNGEON4: levels.LevelState(DUNGEON4, True),
-                  DUNGEON5: levels.LevelState(DUNGEON5, True),
-                  INSTRUCTIONS: main_menu.Instructions(),
-                  LOADGAME: main_menu.LoadGame(),
-                  DEATH_SCENE: death.DeathScene(),
-                  CREDITS: credits.Credits()
+def print_turbo_report(report):
+    print('{} steps in {:.2f}s: {:.0f} steps/s, {:.1f}s of game time'.format(
+        report['steps'], report['seconds'], report['steps per second'],
+        report['game seconds']))
+    for name, steps in sorted(report['states'].items()):
+        print('  {:<14}{:>8} steps'.format(name, steps))
+
+
+def main(turbo_steps=None, turbo_draw=False):
+    """
+    Add states to control here.  States are built the first time
+    they are entered.  With turbo_steps the game runs that many
+    simulation steps flat out, without music, and reports its speed.
+    """
+    run_it = tools.Control(setup.ORIGINAL_CAPTION, setup.MUSIC_PLAYER)
+    if turbo_steps is not None:
+        setup.MUSIC_PLAYER.enabled = False
+    state_dict = {MAIN_MENU: main_menu.Menu,
+                  TOWN: partial(levels.LevelState, TOWN),
+                  CASTLE: partial(levels.LevelState, CASTLE),
+                  HOUSE: partial(levels.LevelState, HOUSE),
+                  OVERWORLD: partial(levels.LevelState, OVERWORLD, True),
+                  BROTHER_HOUSE: partial(levels.LevelState, BROTHER_HOUSE),
+                  INN: shop.Inn,
+                  ARMOR_SHOP: shop.ArmorShop,
+                  WEAPON_SHOP: shop.WeaponShop,
+                  MAGIC_SHOP: shop.MagicShop,
+                  POTION_SHOP: shop.PotionShop,
+                  BATTLE: battle.Battle,
+                  DUNGEON: partial(levels.LevelState, DUNGEON, True),
+                  DUNGEON2: partial(levels.LevelState, DUNGEON2, True),
+                  DUNGEON3: partial(levels.LevelState, DUNGEON3, True),
+                  DUNGEON4: partial(levels.LevelState, DUNGEON4, True),
+                  DUNGEON5: partial(levels.LevelState, DUNGEON5, True),
+                  INSTRUCTIONS: main_menu.Instructions,
+                  LOADGAME: main_menu.LoadGame,
+                  DEATH_SCENE: death.DeathScene,
+                  CREDITS: credits.Credits
                   }
 
     run_it.setup_states(state_dict, c.MAIN_MENU)
+
+    if profiler.is_running():
+        with profiler.phase('first frame'):
+            run_it.update()
+            run_it.draw()
+            pg.display.update()
+        profiler.finish()
+        return
+
+    if turbo_steps is not None:
+        print_turbo_report(run_it.turbo(turbo_steps, turbo_draw))
+        return
+
     run_it.main()
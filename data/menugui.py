@@ -21,7 +21,7 @@ class SmallArrow(pg.sprite.Sprite):
     """
     def __init__(self, info_box):
         super(SmallArrow, self).__init__()
-        self.image = setup.GFX['smallarrow']
+        self.image = setup.UI['smallarrow'].image
         self.rect = self.image.get_rect()
         self.state = 'selectmenu'
         self.state_dict = self.make_state_dict()
@@ -112,8 +112,8 @@ class QuickStats(pg.sprite.Sprite):
         self.game_data = game_data
         self.health = game_data['player stats']['health']
         self.stats = self.game_data['player stats']
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
-        self.small_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 18)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
+        self.small_font = setup.FONT_POOL.get(c.MAIN_FONT, 18)
         self.image, self.rect = self.make_image()
 
     def make_image(self):
@@ -122,12 +122,12 @@ class QuickStats(pg.sprite.Sprite):
         """
         stat_list = ['GOLD', 'health', 'magic'] 
         magic_health_list  = ['health', 'magic']
-        image = setup.GFX['goldbox']
+        image = setup.UI['goldbox']
         rect = image.get_rect(left=10, top=244)
 
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
+        image.draw(surface, (0, 0))
 
         for i, stat in enumerate(stat_list):
             first_letter = stat[0].upper()
@@ -138,7 +138,7 @@ class QuickStats(pg.sprite.Sprite):
                 text = "{}{}: {}/{}".format(first_letter, rest_of_letters, current, max)
             elif stat == 'GOLD':
                 text = "Gold: {}".format(self.inventory[stat]['quantity'])
-            render = self.small_font.render(text, True, c.NEAR_BLACK)
+            render = setup.TEXT.render(self.small_font, text, True, c.NEAR_BLACK)
             x = 26
             y = 45 + (i*30)
             text_rect = render.get_rect(x=x,
@@ -146,9 +146,9 @@ class QuickStats(pg.sprite.Sprite):
             surface.blit(render, text_rect)
 
         if self.game_data['crown quest']:
-            crown = setup.GFX['crown']
+            crown = setup.UI['crown']
             crown_rect = crown.get_rect(x=178, y=40)
-            surface.blit(crown, crown_rect)
+            crown.draw(surface, crown_rect)
         
         return surface, rect
 
@@ -172,14 +172,12 @@ class InfoBox(pg.sprite.Sprite):
         self.player_stats = player_stats
         self.attack_power = self.get_attack_power()
         self.defense_power = self.get_defense_power()
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
-        self.big_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 24)
-        self.title_font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 28)
-        self.title_font.set_underline(True)
-        self.get_tile = tools.get_tile
-        self.sword = self.get_tile(48, 0, setup.GFX['shopsigns'], 16, 16, 2)
-        self.shield = self.get_tile(32, 0, setup.GFX['shopsigns'], 16, 16, 2)
-        self.potion = self.get_tile(16, 0, setup.GFX['shopsigns'], 16, 16, 2)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
+        self.big_font = setup.FONT_POOL.get(c.MAIN_FONT, 24)
+        self.title_font = setup.FONT_POOL.get(c.MAIN_FONT, 28, underline=True)
+        self.sword = self.get_tile(48, 0)
+        self.shield = self.get_tile(32, 0)
+        self.potion = self.get_tile(16, 0)
         self.possible_potions = ['Healing Potion', 'ELIXIR', 'Ether Potion']
         self.possible_armor = ['Wooden Shield', 'Chain Mail']
         self.possible_weapons = ['Long Sword', 'Rapier']
@@ -190,6 +188,14 @@ class InfoBox(pg.sprite.Sprite):
         self.state_dict = self.make_state_dict()
         self.print_slots = True
 
+    def get_tile(self, x, y):
+        """
+        Get the surface and rect for a double size item icon.
+        """
+        surface = setup.FRAMES.get('shopsigns', x, y, 16, 16, 2)
+        return {'surface': surface,
+                'rect': surface.get_rect()}
+
     def get_attack_power(self):
         """
         Calculate the current attack power based on equipped weapons.
@@ -244,7 +250,7 @@ class InfoBox(pg.sprite.Sprite):
                 text = "Gold: {}".format(self.inventory['GOLD']['quantity'])
             else:
                 text = "{}: {}".format(stat, str(self.player_stats[stat]))
-            text_image = self.font.render(text, True, c.NEAR_BLACK)
+            text_image = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(x=50, y=80+(i*50))
             surface.blit(text_image, text_rect)
 
@@ -326,7 +332,7 @@ class InfoBox(pg.sprite.Sprite):
                                        self.inventory[item]['quantity'])
             else:
                 text = "{}".format(self.slots[coord])
-            text_image = self.font.render(text, True, c.NEAR_BLACK)
+            text_image = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(topleft=coord)
             surface.blit(text_image, text_rect)
 
@@ -345,7 +351,7 @@ class InfoBox(pg.sprite.Sprite):
         surface, rect = self.make_blank_info_box(title)
 
         for i, item in enumerate(item_list):
-            text_image = self.font.render(item, True, c.NEAR_BLACK)
+            text_image = setup.TEXT.render(self.font, item, True, c.NEAR_BLACK)
             text_rect = text_image.get_rect(x=100, y=80+(i*50))
             surface.blit(text_image, text_rect)
 
@@ -362,15 +368,15 @@ class InfoBox(pg.sprite.Sprite):
 
     def make_blank_info_box(self, title):
         """Make an info box with title, otherwise blank"""
-        image = setup.GFX['playerstatsbox']
+        image = setup.UI['playerstatsbox']
         rect = image.get_rect(left=285, top=35)
         centerx = rect.width / 2
 
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0,0))
+        image.draw(surface, (0,0))
 
-        title_image = self.title_font.render(title, True, c.NEAR_BLACK)
+        title_image = setup.TEXT.render(self.title_font, title, True, c.NEAR_BLACK)
         title_rect = title_image.get_rect(centerx=centerx, y=30)
         surface.blit(title_image, title_rect)
 
@@ -389,20 +395,20 @@ class InfoBox(pg.sprite.Sprite):
 
 class SelectionBox(pg.sprite.Sprite):
     def __init__(self):
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.image, self.rect = self.make_image()
 
     def make_image(self):
         choices = ['Items', 'Magic', 'Stats']
-        image = setup.GFX['goldbox']
+        image = setup.UI['goldbox']
         rect = image.get_rect(left=10, top=425)
 
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
+        image.draw(surface, (0, 0))
 
         for i, choice in enumerate(choices):
-            choice_image = self.font.render(choice, True, c.NEAR_BLACK)
+            choice_image = setup.TEXT.render(self.font, choice, True, c.NEAR_BLACK)
             choice_rect = choice_image.get_rect(x=100, y=(15 + (i * 45)))
             surface.blit(choice_image, choice_rect)
 
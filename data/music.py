@@ -0,0 +1,228 @@
+"""
+Music service.  Tracks are read into memory by a worker thread ahead
+of time, so starting one never waits on the disk.  Switching tracks
+never blocks the game loop: the old track is faded out a frame at a
+time by update(), and the new one starts once its data has arrived.
+"""
+import io, sys, threading
+import pygame as pg
+from . import cache
+
+#Python 2/3 compatibility.
+if sys.version_info[0] == 2:
+    import Queue as queue
+else:
+    import queue
+
+
+STOPPED = 'stopped'
+PLAYING = 'playing'
+FADING_OUT = 'fading out'
+WAITING = 'waiting'
+FADING_IN = 'fading in'
+
+
+def read_file(path):
+    with open(path, 'rb') as music_file:
+        return music_file.read()
+
+
+class MusicPlayer(object):
+    """
+    Plays one track at a time through pg.mixer.music, crossfading
+    between tracks.  Call update() once per frame.  While enabled is
+    False, play() and prefetch() do nothing.
+    """
+    def __init__(self, max_bytes=None, fade_time=0):
+        self.fade_time = fade_time
+        self.cache = cache.LRUCache(max_bytes, len)
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.requested = set()
+        self.worker = None
+        self.enabled = True
+
+        self.state = STOPPED
+        self.path = None
+        self.file = None
+        self.volume = 0.0
+        self.target_volume = 0.0
+        self.next_path = None
+        self.next_volume = 0.0
+        self.fade_start = 0
+        self.fade_length = 0
+        self.fade_from = 0.0
+        self.waits = 0
+
+    def start_worker(self):
+        self.worker = threading.Thread(target=self.fetch_loop)
+        self.worker.daemon = True
+        self.worker.start()
+
+    def fetch_loop(self):
+        """
+        Worker thread: read requested tracks into the cache.
+        """
+        while True:
+            path = self.requests.get()
+            try:
+                data = read_file(path)
+            except (IOError, OSError):
+                data = None
+            with self.lock:
+                self.requested.discard(path)
+                if data is not None:
+                    self.cache.put(path, data)
+                elif path == self.next_path:
+                    # the track can't be read, so stop waiting for it
+                    self.cache.unpin(path)
+                    self.next_path = None
+                    if self.state == WAITING:
+                        self.state = STOPPED
+
+    def prefetch(self, path):
+        """
+        Ask the worker to read a track into memory, if it isn't already.
+        """
+        if not self.enabled:
+            return
+
+        with self.lock:
+            if path in self.cache or path in self.requested:
+                return
+            self.requested.add(path)
+
+        if self.worker is None:
+            self.start_worker()
+        self.requests.put(path)
+
+    def get_data(self, path):
+        with self.lock:
+            if path in self.cache:
+                return self.cache.get(path)
+        return None
+
+    def play(self, path, volume=None, fade_time=None):
+        """
+        Switch to path, fading the current track out over the first
+        half of fade_time and the new one in over the second half.
+        A volume of None keeps the current volume.
+        """
+        if not self.enabled:
+            return
+
+        if fade_time is None:
+            fade_time = self.fade_time
+        if volume is None:
+            volume = self.target_volume
+
+        if path == self.path and self.state in (PLAYING, FADING_IN):
+            self.target_volume = volume
+            if self.state == PLAYING:
+                self.set_volume(volume)
+            return
+
+        # keep the track in memory until it has started, so tracks
+        # prefetched during the fade out can't push it out of the cache
+        with self.lock:
+            if self.next_path is not None:
+                self.cache.unpin(self.next_path)
+            self.cache.pin(path)
+            if path in self.cache:
+                self.cache.get(path)
+            self.next_path = path
+
+        self.prefetch(path)
+        self.next_volume = volume
+        self.fade_length = fade_time // 2
+
+        if self.state in (PLAYING, FADING_IN) and self.fade_length:
+            self.begin_fade(FADING_OUT, self.volume)
+        else:
+            self.state = WAITING
+
+    def begin_fade(self, state, fade_from):
+        self.state = state
+        self.fade_start = pg.time.get_ticks()
+        self.fade_from = fade_from
+
+    def set_volume(self, volume):
+        self.volume = volume
+        pg.mixer.music.set_volume(volume)
+
+    def fade_progress(self):
+        if not self.fade_length:
+            return 1.0
+        elapsed = pg.time.get_ticks() - self.fade_start
+        return min(1.0, elapsed / float(self.fade_length))
+
+    def start_next(self, path):
+        """
+        Start the pending track if its data has arrived.
+        """
+        data = self.get_data(path)
+        if data is None:
+            return False
+
+        with self.lock:
+            self.cache.unpin(path)
+            self.next_path = None
+
+        self.file = io.BytesIO(data)
+        pg.mixer.music.load(self.file)
+        self.path = path
+        self.target_volume = self.next_volume
+        if self.fade_length:
+            self.set_volume(0.0)
+            pg.mixer.music.play(-1)
+            self.begin_fade(FADING_IN, 0.0)
+        else:
+            self.set_volume(self.target_volume)
+            pg.mixer.music.play(-1)
+            self.state = PLAYING
+
+        return True
+
+    def update(self):
+        """
+        Advance fades and start the pending track once it is in memory.
+        """
+        if self.state == FADING_OUT:
+            progress = self.fade_progress()
+            self.set_volume(self.fade_from * (1.0 - progress))
+            if progress >= 1.0:
+                pg.mixer.music.stop()
+                self.state = WAITING
+
+        if self.state == WAITING:
+            path = self.next_path
+            if path is None:
+                self.state = STOPPED
+            elif not self.start_next(path):
+                self.waits += 1
+                # ask again if the data never arrived or was evicted
+                self.prefetch(path)
+
+        elif self.state == FADING_IN:
+            progress = self.fade_progress()
+            self.set_volume(self.target_volume * progress)
+            if progress >= 1.0:
+                self.state = PLAYING
+
+    def is_settled(self):
+        """
+        Return True if no fade or track change is in progress, so
+        update() has nothing to do until the next play().
+        """
+        return self.state in (STOPPED, PLAYING)
+
+    def stats(self):
+        """
+        Return cache usage and the number of frames spent waiting for
+        a track that had not been prefetched.
+        """
+        with self.lock:
+            stats = self.cache.stats()
+        stats['waits'] = self.waits
+        stats['state'] = self.state
+        return stats
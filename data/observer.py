@@ -87,9 +87,7 @@ class MusicChange(object):
         if event in self.event_dict:
             new_music = self.event_dict[event]
             if new_music in setup.MUSIC:
-                music_file = setup.MUSIC[new_music]
-                pg.mixer.music.load(music_file)
-                pg.mixer.music.play(-1)
+                setup.MUSIC_PLAYER.play(setup.MUSIC[new_music])
 
 
 
@@ -0,0 +1,181 @@
+"""
+Level preloader.  The portals of the current level name the levels the
+player can walk to next.  While the player walks, a worker thread parses
+those maps.  Anything that touches surfaces - loading tile images into
+the atlas and rendering the part of each map the player will arrive in -
+is left to update(), on the main thread, one step per frame.
+"""
+import collections, sys, threading
+import pygame as pg
+from . import tilerender
+
+#Python 2/3 compatibility.
+if sys.version_info[0] == 2:
+    import Queue as queue
+else:
+    import queue
+
+
+class LevelPreloader(object):
+    """
+    Keeps a Renderer, and the chunks around the arrival point, ready
+    for each neighbouring level.  Call update() once per frame.
+    """
+    def __init__(self, chunks, chunk_size, view_size):
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.view_size = view_size
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+
+        self.wanted = {}
+        self.pending = set()
+        self.outstanding = 0
+        self.chunk_queue = collections.deque()
+        self.renderers = {}
+        self.hits = 0
+        self.misses = 0
+
+    def start_worker(self):
+        self.worker = threading.Thread(target=self.work_loop)
+        self.worker.daemon = True
+        self.worker.start()
+
+    def work_loop(self):
+        """
+        Worker thread: parse maps.
+        """
+        while True:
+            task = self.requests.get()
+            try:
+                filename = task[1]
+                result = 'parsed', filename, tilerender.parse_map(filename)
+            except Exception:
+                result = 'failed', task[1]
+            self.results.put(result)
+
+    def preload(self, levels, came_from, current=None):
+        """
+        Prepare levels, a dict of {state name: tmx filename}, to be
+        entered from the level named came_from.  The Renderer of the
+        current level is kept too, for coming back to it after a battle.
+        Levels that are no longer wanted are dropped.
+        """
+        self.wanted = dict((filename, came_from)
+                           for filename in levels.values())
+        if current is not None:
+            filename = current.tmx_data.filename
+            self.wanted.setdefault(filename, None)
+            self.renderers[filename] = current
+
+        for filename in list(self.renderers):
+            if filename not in self.wanted:
+                del self.renderers[filename]
+
+        for filename in self.wanted:
+            if filename not in self.renderers and filename not in self.pending:
+                self.pending.add(filename)
+                self.request('parse', filename)
+
+    def request(self, *task):
+        if self.worker is None:
+            self.start_worker()
+        self.outstanding += 1
+        self.requests.put(task)
+
+    def take(self, filename):
+        """
+        Return the preloaded Renderer for filename, or a new one.
+        """
+        renderer = self.renderers.pop(filename, None)
+        if renderer is None:
+            self.misses += 1
+            return tilerender.Renderer(filename)
+        self.hits += 1
+        return renderer
+
+    def update(self):
+        """
+        Finish one piece of work: a map the worker has parsed, or else
+        one queued chunk of a preloaded level.
+        """
+        try:
+            result = self.results.get_nowait()
+        except queue.Empty:
+            self.render_next_chunk()
+            return
+
+        self.outstanding -= 1
+        if result[0] == 'parsed':
+            self.finish_parse(*result[1:])
+        else:
+            self.pending.discard(result[1])
+
+    def render_next_chunk(self):
+        """
+        Render and cache the next queued chunk of a level that is still
+        wanted.
+        """
+        while self.chunk_queue:
+            chunked_map, column, row = self.chunk_queue.popleft()
+            filename = chunked_map.renderer.tmx_data.filename
+            if (self.renderers.get(filename) is chunked_map.renderer
+                    and not chunked_map.has_chunk(column, row)):
+                chunked_map.get_chunk(column, row)
+                return
+
+    def finish_parse(self, filename, tmx_data):
+        """
+        Load the images of a parsed map and queue the chunks around where
+        the player will arrive.  If the level was entered before the
+        parse finished, it already has its renderer and this is dropped.
+        """
+        self.pending.discard(filename)
+        if filename not in self.wanted or filename in self.renderers:
+            return
+
+        renderer = tilerender.Renderer(filename, tmx_data)
+        self.renderers[filename] = renderer
+
+        chunked_map = tilerender.ChunkedMap(renderer, self.chunks,
+                                            self.chunk_size)
+        arrival = self.arrival_view(chunked_map, self.wanted[filename])
+        if arrival is None:
+            return
+
+        for column, row in chunked_map.chunks_in(arrival):
+            if not chunked_map.has_chunk(column, row):
+                self.chunk_queue.append((chunked_map, column, row))
+
+    def arrival_view(self, chunked_map, came_from):
+        """
+        Return the area of the map on screen when arriving from the
+        level came_from, or None if there is no start point for it.
+        """
+        tmx_data = chunked_map.renderer.tmx_data
+        for start in tmx_data.getObjectsByName('start point'):
+            if start.__dict__.get('state') == came_from:
+                view = pg.Rect((0, 0), self.view_size)
+                view.center = start.x * 2 + 16, start.y * 2 - 16
+                # levels may cut a little off the bottom of the map,
+                # which can move the view up
+                view.top -= 32
+                view.height += 32
+                return view.clamp(chunked_map.rect)
+
+        return None
+
+    def is_busy(self):
+        """
+        Return True while the worker has tasks out or chunks are queued,
+        so update() still has work to finish.
+        """
+        return self.outstanding > 0 or bool(self.chunk_queue)
+
+    def stats(self):
+        return {'ready': len(self.renderers),
+                'pending': len(self.pending),
+                'chunks queued': len(self.chunk_queue),
+                'hits': self.hits,
+                'misses': self.misses}
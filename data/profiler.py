@@ -0,0 +1,131 @@
+"""
+Startup profiler.  When started (The_Stolen_Crown.py --profile-startup)
+it records a tree of timed phases: display setup, asset registries,
+state construction, map rendering and the decode time of every asset
+loaded along the way.  The tree is written out as json once the first
+frame has been drawn.  When the profiler is not running, phase() and
+record() do nothing.
+"""
+import json, platform, sys, time
+from contextlib import contextmanager
+import pygame as pg
+from .cache import timer
+
+
+class Phase(object):
+    """
+    A timed node of the startup tree.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.children = []
+
+    def to_dict(self):
+        phase = {'name': self.name, 'seconds': round(self.seconds, 6)}
+        if self.children:
+            phase['children'] = [child.to_dict() for child in self.children]
+        return phase
+
+
+class StartupProfile(object):
+    """
+    Stack of open phases, rooted at the whole startup.
+    """
+    def __init__(self, output):
+        self.output = output
+        self.root = Phase('startup')
+        self.stack = [self.root]
+        self.start_time = timer()
+
+    @contextmanager
+    def phase(self, name):
+        node = Phase(name)
+        self.stack[-1].children.append(node)
+        self.stack.append(node)
+        start = timer()
+        try:
+            yield node
+        finally:
+            node.seconds = timer() - start
+            self.stack.pop()
+
+    def record(self, name, seconds):
+        node = Phase(name)
+        node.seconds = seconds
+        self.stack[-1].children.append(node)
+
+    def report(self):
+        """
+        Return the profile as a json-ready dictionary.
+        """
+        self.root.seconds = timer() - self.start_time
+        return {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'pygame': pg.version.ver,
+                'platform': sys.platform,
+                'tree': self.root.to_dict()}
+
+
+PROFILE = None
+
+
+def start(output='-'):
+    """
+    Start recording.  The report is written to output, or printed if
+    output is '-'.
+    """
+    global PROFILE
+    PROFILE = StartupProfile(output)
+
+
+def is_running():
+    return PROFILE is not None
+
+
+@contextmanager
+def phase(name):
+    """
+    Time the body of a with statement as a child of the current phase.
+    """
+    if PROFILE is None:
+        yield None
+    else:
+        with PROFILE.phase(name) as node:
+            yield node
+
+
+def record(name, seconds):
+    """
+    Add an already measured phase, such as an asset decode.
+    """
+    if PROFILE is not None:
+        PROFILE.record(name, seconds)
+
+
+def call(name, function, *args):
+    """
+    Call function(*args) inside a phase and return its result.
+    """
+    with phase(name):
+        return function(*args)
+
+
+def finish():
+    """
+    Stop recording and write the report.
+    """
+    global PROFILE
+    profile, PROFILE = PROFILE, None
+    if profile is None:
+        return None
+
+    report = profile.report()
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if profile.output == '-':
+        print(text)
+    else:
+        with open(profile.output, 'w') as output_file:
+            output_file.write(text + '\n')
+
+    return report
@@ -1,5 +1,5 @@
-from data.pytmx.tmxloader import load_pygame, load_tmx
-from data.pytmx.utils import buildDistributionRects
+from data.pytmx.tmxloader import load_pygame, load_tmx, TilesetCache
+from data.pytmx.utils import buildDistributionRects, merge_rects
 from data.pytmx.pytmx import *
 
 __version__ = '2.16.4'
@@ -0,0 +1,146 @@
+"""
+Compiled map cache.
+
+Parsing a tmx file means walking the xml, base64 and zlib decoding every
+layer and unpacking each gid.  A compiled map is the parsed TiledMap
+(layer arrays, gid map, tile properties, tilesets and objects) pickled
+into a small binary file.  The file records the path, size and mtime of
+the tmx it was made from, and is ignored once the tmx changes.
+
+The game only reads the cache.  Prebuild it, along with the blit format
+of every tile, with:
+
+    python -m data.pytmx.compiled
+"""
+import os, struct, sys, zlib
+
+from .pytmx import TiledMap
+
+if sys.version_info[0] == 2:
+    import cPickle as pickle
+else:
+    import pickle
+
+
+__all__ = ['compiled_path', 'load_compiled', 'save_compiled', 'load_map']
+
+MAGIC = b'PYTMX-COMPILED-3\n'
+HEADER = struct.Struct('<qqH')
+
+
+def compiled_path(filename, cache_dir):
+    """
+    return the path of the compiled file for a tmx file
+    """
+    name = os.path.splitext(os.path.basename(filename))[0]
+    return os.path.join(cache_dir, name + '.tmxc')
+
+
+def source_key(filename):
+    """
+    return the (size, mtime, path) a compiled file must match
+    """
+    stat = os.stat(filename)
+    path = os.path.normpath(filename).replace(os.sep, '/')
+    return stat.st_size, int(stat.st_mtime), path.encode('utf-8')
+
+
+def load_compiled(filename, cache_dir):
+    """
+    return the TiledMap compiled from filename, or None if there is no
+    up to date compiled file
+    """
+    path = compiled_path(filename, cache_dir)
+    try:
+        with open(path, 'rb') as compiled_file:
+            data = compiled_file.read()
+    except (IOError, OSError):
+        return None
+
+    if not data.startswith(MAGIC):
+        return None
+
+    offset = len(MAGIC)
+    size, mtime, path_length = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+    key = size, mtime, data[offset:offset + path_length]
+    if key != source_key(filename):
+        return None
+
+    try:
+        return pickle.loads(zlib.decompress(data[offset + path_length:]))
+    except Exception:
+        return None
+
+
+def save_compiled(tiledmap, cache_dir):
+    """
+    write a parsed map to the cache and return the compiled file's path
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+
+    size, mtime, path = source_key(tiledmap.filename)
+    payload = zlib.compress(pickle.dumps(tiledmap, 2))
+    output = compiled_path(tiledmap.filename, cache_dir)
+
+    # write to a temporary file first so a crash never leaves half a file
+    temporary = output + '.tmp'
+    with open(temporary, 'wb') as compiled_file:
+        compiled_file.write(MAGIC)
+        compiled_file.write(HEADER.pack(size, mtime, len(path)))
+        compiled_file.write(path)
+        compiled_file.write(payload)
+
+    if os.path.exists(output):
+        os.remove(output)
+    os.rename(temporary, output)
+
+    return output
+
+
+def load_map(filename, source=None, cache_dir=None):
+    """
+    return a TiledMap for filename, from the compiled cache if possible,
+    otherwise parsed from the tmx.  the cache is only read here.
+    """
+    if cache_dir:
+        tiledmap = load_compiled(filename, cache_dir)
+        if tiledmap is not None:
+            tiledmap.filename = filename
+            return tiledmap
+
+    return TiledMap(filename, source)
+
+
+def main():
+    import argparse
+    import pygame
+    from .tmxloader import load_pygame
+
+    parser = argparse.ArgumentParser(description='Compile tmx maps.')
+    parser.add_argument('maps', nargs='*',
+                        help='tmx files to compile (default: all in resources/tmx)')
+    parser.add_argument('--output', default=os.path.join('resources', 'tmx', 'compiled'),
+                        help='directory for the compiled maps')
+    args = parser.parse_args()
+
+    maps = args.maps
+    if not maps:
+        directory = os.path.join('resources', 'tmx')
+        maps = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                if name.lower().endswith('.tmx')]
+
+    # tile formats are worked out from the converted tileset images,
+    # which needs a display
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    for filename in maps:
+        tiledmap = load_pygame(filename, pixelalpha=True)
+        output = save_compiled(tiledmap, args.output)
+        print('{0} -> {1} ({2} bytes)'.format(filename, output, os.path.getsize(output)))
+
+
+if __name__ == '__main__':
+    main()
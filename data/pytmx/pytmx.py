@@ -3,6 +3,13 @@ from xml.etree import ElementTree
 
 from .utils import decode_gid, types, parse_properties, read_points
 
+# numpy is optional.  with it, layer data is decoded in a few vectorized
+# steps and stored as 2d arrays; without it, layers are lists of arrays.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 __all__ = ['TiledMap', 'TiledTileset', 'TiledLayer', 'TiledObject', 'TiledObjectGroup', 'TiledImageLayer']
 
@@ -38,7 +45,7 @@ class TiledMap(TiledElement):
 
     reserved = "visible version orientation width height tilewidth tileheight properties tileset layer objectgroup".split()
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, source=None):
         from collections import defaultdict
 
         TiledElement.__init__(self)
@@ -49,9 +56,15 @@ class TiledMap(TiledElement):
         self.all_layers = []  # list of all layers in proper order
         self.tile_properties = {}  # dict of tiles that have metadata
         self.filename = filename
+        self.source = source  # optional file object to read the tmx from
 
         self.layernames = {}
 
+        # objects indexed by name, type and tile position, see indexObjects
+        self.objects_by_name = {}
+        self.objects_by_type = {}
+        self.objects_by_tile = {}
+
         # only used tiles are actually loaded, so there will be a difference
         # between the GIDs in the Tile map data (tmx) and the data in this
         # class and the layers.  This dictionary keeps track of that difference.
@@ -78,6 +91,18 @@ class TiledMap(TiledElement):
     def __repr__(self):
         return "<{0}: \"{1}\">".format(self.__class__.__name__, self.filename)
 
+    def __getstate__(self):
+        """
+        pickled maps (see compiled.py) leave out the source file object and
+        anything added by a loader, such as the tile images
+        """
+        state = self.__dict__.copy()
+        state['source'] = None
+        state['images'] = []
+        state.pop('regions', None)
+        state.pop('formats', None)
+        return state
+
     def getTileImage(self, x, y, layer):
         """
         return the tile image for this location
@@ -160,6 +185,45 @@ class TiledMap(TiledElement):
 
         return chain(*(i for i in self.objectgroups))
 
+    def getObjectsByName(self, name):
+        """
+        Return a list of the objects named name, in map order
+        """
+
+        return self.objects_by_name.get(name, [])
+
+    def getObjectsByType(self, type):
+        """
+        Return a list of the objects of type type, in map order
+        """
+
+        return self.objects_by_type.get(type, [])
+
+    def getObjectsAt(self, x, y):
+        """
+        Return a list of the objects whose top left corner is in the tile
+        at x, y, in map order
+        """
+
+        return self.objects_by_tile.get((x, y), [])
+
+    def indexObjects(self):
+        """
+        build the lookups used by getObjectsByName, getObjectsByType and
+        getObjectsAt.  called once the map is loaded.
+        """
+
+        self.objects_by_name = {}
+        self.objects_by_type = {}
+        self.objects_by_tile = {}
+
+        for o in self.objects:
+            self.objects_by_name.setdefault(o.name, []).append(o)
+            self.objects_by_type.setdefault(o.type, []).append(o)
+            if self.tilewidth and self.tileheight:
+                tile = o.x // self.tilewidth, o.y // self.tileheight
+                self.objects_by_tile.setdefault(tile, []).append(o)
+
     def getTileProperties(self, (x, y, layer)):
         """
         return the properties for the tile, if any
@@ -271,6 +335,25 @@ class TiledMap(TiledElement):
         else:
             return 0
 
+    def register_gids(self, raw_gids):
+        """
+        vectorized register_gid for a numpy array of raw gids from a layer.
+        distinct values are registered in order of first appearance, so
+        the internal gids are the same as if each tile was registered in
+        turn.
+
+        returns an array of internal gids the same shape as raw_gids
+        """
+        values, first, inverse = np.unique(raw_gids, return_index=True,
+                                           return_inverse=True)
+        internal = np.zeros(len(values), dtype=np.uint32)
+        for i in np.argsort(first, kind='mergesort'):
+            internal[i] = self.register_gid(*decode_gid(int(values[i])))
+
+        if self.maxgid <= 0xffff:
+            internal = internal.astype(np.uint16)
+        return internal[inverse]
+
     def map_gid(self, real_gid):
         """
         used to lookup a GID read from a TMX file's data
@@ -291,7 +374,7 @@ class TiledMap(TiledElement):
         """
         parse a map node from a tiled tmx file
         """
-        etree = ElementTree.parse(self.filename).getroot()
+        etree = ElementTree.parse(self.source or self.filename).getroot()
         self.set_properties(etree)
 
         # initialize the gid mapping
@@ -319,6 +402,8 @@ class TiledMap(TiledElement):
             if p:
                 o.__dict__.update(p)
 
+        self.indexObjects()
+
     def addTileLayer(self, layer):
         """
         Add a TiledLayer layer object to the map.
@@ -412,6 +497,11 @@ class TiledTileset(TiledElement):
         self.width = 0
         self.height = 0
 
+        # blit format of each tile, by position in the image.  filled in by
+        # the pygame loader and kept in compiled maps; see tmxloader.
+        self.formats = {}
+        self.formats_key = None
+
         self.parse(node)
 
     def __repr__(self):
@@ -484,8 +574,13 @@ class TiledLayer(TiledElement):
         return self.iter_tiles()
 
     def iter_tiles(self):
-        for y, x in product(range(self.height), range(self.width)):
-            yield x, y, self.data[y][x]
+        rows = self.data
+        if np is not None and isinstance(rows, np.ndarray):
+            rows = rows.tolist()
+
+        for y, row in enumerate(rows):
+            for x, gid in enumerate(row):
+                yield x, y, gid
 
     def __repr__(self):
         return "<{0}: \"{1}\">".format(self.__class__.__name__, self.name)
@@ -513,9 +608,11 @@ class TiledLayer(TiledElement):
             data = decodestring(data_node.text.strip())
 
         elif encoding == "csv":
-            next_gid = imap(int, "".join(
-                line.strip() for line in data_node.text.strip()
-            ).split(","))
+            text = "".join(line.strip() for line in data_node.text.strip())
+            if np is not None:
+                data = np.array(text.split(","), dtype=np.uint32)
+            else:
+                next_gid = imap(int, text.split(","))
 
         elif encoding:
             msg = "TMX encoding type: {0} is not supported."
@@ -539,6 +636,19 @@ class TiledLayer(TiledElement):
             msg = "TMX compression type: {0} is not supported."
             raise Exception, msg.format(str(attr["compression"]))
 
+        if np is not None:
+            if encoding is None:
+                gids = [int(child.get('gid')) for child in data_node.findall('tile')]
+                raw_gids = np.array(gids, dtype=np.uint32)
+            elif encoding == "csv":
+                raw_gids = data
+            else:
+                raw_gids = np.frombuffer(data, dtype='<u4')
+
+            raw_gids = raw_gids[:self.width * self.height]
+            self.data = self.parent.register_gids(raw_gids).reshape(self.height, self.width)
+            return
+
         # if data is None, then it was not decoded or decompressed, so
         # we assume here that it is going to be a bunch of tile elements
         # TODO: this will probably raise an exception if there are no tiles
@@ -3,11 +3,22 @@ import os
 
 import pygame
 
-from data.pytmx import pytmx
+from data.pytmx import pytmx, compiled
 from .constants import *
 
 
-__all__ = ['load_pygame', 'load_tmx']
+__all__ = ['load_pygame', 'load_tmx', 'TilesetCache', 'classify_tile']
+
+
+# tile formats, fastest to slowest to blit
+OPAQUE = 'opaque'
+COLORKEY = 'colorkey'
+ALPHA = 'alpha'
+
+# colorkey given to tiles whose pixels are all either opaque or invisible.
+# black is the key the game's sprite sheets use, so these tiles share their
+# atlas pages; tiles with opaque black pixels keep perpixel alpha.
+AUTO_COLORKEY = pygame.Color(0, 0, 0)
 
 
 def handle_transformation(tile, flags):
@@ -33,21 +44,61 @@ def handle_transformation(tile, flags):
         return tile
 
 
-def smart_convert(original, colorkey, force_colorkey, pixelalpha):
+def image_key(path):
+    """
+    return the (size, mtime) of an image file, or None if it can't be read.
+    tile formats stored in compiled maps are used until the image changes.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, int(stat.st_mtime)
+
+
+def classify_tile(original):
+    """
+    return the fastest format that can draw a tile without changing it:
+
+    OPAQUE if every pixel is opaque,
+    COLORKEY if every pixel is either opaque or fully transparent, and no
+        opaque pixel is the same color as AUTO_COLORKEY,
+    ALPHA otherwise.
+    """
+    width, height = original.get_size()
+
+    # pixels that are fully opaque, and pixels that are visible at all
+    opaque = pygame.mask.from_surface(original, 254)
+    visible = pygame.mask.from_surface(original, 0)
+
+    if opaque.count() == width * height:
+        return OPAQUE
+
+    if opaque.count() == visible.count():
+        keyed = pygame.mask.from_threshold(original, AUTO_COLORKEY, (1, 1, 1, 255))
+        if not keyed.overlap_area(opaque, (0, 0)):
+            return COLORKEY
+
+    return ALPHA
+
+
+def smart_convert(original, colorkey, force_colorkey, pixelalpha, tile_format=None):
     """
     this method does several tests on a surface to determine the optimal
     flags and pixel format for each tile surface.
 
     this is done for the best rendering speeds and removes the need to
     convert() the images on your own
+
+    tile_format is the result of classify_tile, if it is already known.
     """
     tile_size = original.get_size()
 
-    # count the number of pixels in the tile that are not transparent
-    px = pygame.mask.from_surface(original).count()
+    if tile_format is None:
+        tile_format = classify_tile(original)
 
     # there are no transparent pixels in the image
-    if px == tile_size[0] * tile_size[1]:
+    if tile_format == OPAQUE:
         tile = original.convert()
 
     # there are transparent pixels, and set to force a colorkey
@@ -62,6 +113,14 @@ def smart_convert(original, colorkey, force_colorkey, pixelalpha):
         tile = original.convert()
         tile.set_colorkey(colorkey, pygame.RLEACCEL)
 
+    # every pixel is opaque or invisible, so a colorkey draws it the same
+    # as perpixel alpha, only faster
+    elif pixelalpha and tile_format == COLORKEY:
+        tile = pygame.Surface(tile_size)
+        tile.fill(AUTO_COLORKEY)
+        tile.blit(original, (0, 0))
+        tile.set_colorkey(AUTO_COLORKEY, pygame.RLEACCEL)
+
     # there are transparent pixels, and set for perpixel alpha
     elif pixelalpha:
         tile = original.convert_alpha()
@@ -73,6 +132,51 @@ def smart_convert(original, colorkey, force_colorkey, pixelalpha):
     return tile
 
 
+class TilesetCache(object):
+    """
+    tileset images and the tiles converted from them, shared by every map
+    loaded with the same cache.  images are keyed by path, tiles by path,
+    position, flip flags and the conversion options.  once a tileset has
+    been loaded, another map using it only has to remap its gids.
+
+    tiles are stored as they were packed, so a cache must always be used
+    with the same atlas set (or always without one).
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.tiles = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_image(self, path, image_loader):
+        try:
+            return self.images[path]
+        except KeyError:
+            image = self.images[path] = image_loader(path)
+            return image
+
+    def get_tile(self, key, make_tile):
+        """
+        return the (image, region) for key, calling make_tile() to make it
+        if it isn't cached
+        """
+        try:
+            tile = self.tiles[key]
+        except KeyError:
+            tile = self.tiles[key] = make_tile()
+            self.misses += 1
+        else:
+            self.hits += 1
+        return tile
+
+    def stats(self):
+        return {'images': len(self.images),
+                'tiles': len(self.tiles),
+                'hits': self.hits,
+                'misses': self.misses}
+
+
 def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
     """
     Utility function to load images.
@@ -97,6 +201,15 @@ def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
     will not preserve the transparency of the tile if it uses partial
     transparency (which you shouldn't be doing anyway, this is SDL).
 
+    if an atlas set is passed as "atlas", the converted images are packed into
+    it, on pages of the same format.  colorkey tiles are RLE accelerated,
+    so the atlas keeps them as they are.
+    tmxdata.images then holds views of the packed images and
+    tmxdata.regions the atlas regions themselves.
+
+    if a TilesetCache is passed as "tileset_cache", tileset images are only
+    read and converted the first time any map uses them.
+
     TL;DR:
     Don't attempt to convert() or convert_alpha() the individual tiles.  It is
     already done for you.
@@ -104,6 +217,9 @@ def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
 
     pixelalpha = kwargs.get("pixelalpha", False)
     force_colorkey = kwargs.get("force_colorkey", False)
+    image_loader = kwargs.get("image_loader", pygame.image.load)
+    atlas = kwargs.get("atlas", None)
+    tilesets = kwargs.get("tileset_cache", None) or TilesetCache()
 
     if force_colorkey:
         pixelalpha = True
@@ -122,12 +238,36 @@ def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
 
     # initialize the array of images
     tmxdata.images = [0] * tmxdata.maxgid
+    tmxdata.regions = [0] * tmxdata.maxgid
+
+    def pack(key, image):
+        if atlas is None:
+            return image, 0
+        region = atlas.add(key, image)
+        return region.image, region
+
+    def make_tile(image, rect, flags, colorkey, key, tile_format):
+        def make():
+            tile = handle_transformation(image.subsurface(rect), flags)
+            tile = smart_convert(tile, colorkey, force_colorkey, pixelalpha, tile_format)
+            return pack(key, tile)
+        return make
+
+    options = pixelalpha, str(force_colorkey)
+    tmxdata.formats = [None] * tmxdata.maxgid
 
     for ts in tmxdata.tilesets:
         path = os.path.join(os.path.dirname(tmxdata.filename), ts.source)
-        image = pygame.image.load(path)
+        image = tilesets.get_image(path, image_loader)
         w, h = image.get_size()
 
+        # tile formats worked out by the prebuild command are stored in the
+        # compiled map, and used unless the tileset image has changed since
+        formats_key = image_key(path)
+        if ts.formats_key != formats_key:
+            ts.formats = {}
+            ts.formats_key = formats_key
+
         # margins and spacing
         tilewidth = ts.tilewidth + ts.spacing
         tileheight = ts.tileheight + ts.spacing
@@ -157,12 +297,16 @@ def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
             gids = tmxdata.map_gid(real_gid)
 
             if gids:
-                original = image.subsurface(((x, y), tile_size))
+                tile_format = ts.formats.get((x, y))
+                if tile_format is None:
+                    original = image.subsurface(((x, y), tile_size))
+                    tile_format = ts.formats[(x, y)] = classify_tile(original)
 
                 for gid, flags in gids:
-                    tile = handle_transformation(original, flags)
-                    tile = smart_convert(tile, colorkey, force_colorkey, pixelalpha)
-                    tmxdata.images[gid] = tile
+                    key = ('tile', path, x, y, tile_size, flags) + options + (str(colorkey),)
+                    make = make_tile(image, ((x, y), tile_size), flags, colorkey, key, tile_format)
+                    tmxdata.images[gid], tmxdata.regions[gid] = tilesets.get_tile(key, make)
+                    tmxdata.formats[gid] = tile_format
 
     # load image layer images
     for layer in tmxdata.all_layers:
@@ -177,9 +321,17 @@ def _load_images_pygame(tmxdata, mapping, *args, **kwargs):
                 gid = tmxdata.register_gid(real_gid)
                 layer.gid = gid
                 path = os.path.join(os.path.dirname(tmxdata.filename), source)
-                image = pygame.image.load(path)
-                image = smart_convert(image, colorkey, force_colorkey, pixelalpha)
+                key = ('image', path) + options + (str(colorkey),)
+
+                def make_image():
+                    image = image_loader(path)
+                    image = smart_convert(image, colorkey, force_colorkey, pixelalpha)
+                    return pack(key, image)
+
+                image, region = tilesets.get_tile(key, make_image)
                 tmxdata.images.append(image)
+                tmxdata.regions.append(region)
+                tmxdata.formats.append(None)
 
 
 def load_pygame(filename, *args, **kwargs):
@@ -187,8 +339,24 @@ def load_pygame(filename, *args, **kwargs):
     PYGAME USERS: Use me.
 
     Load a TMX file, load the images, and return a TiledMap class that is ready to use.
+
+    "source" may be a file object to read the map from instead of the
+    file itself, and "image_loader" a replacement for pygame.image.load.
+    "tileset_cache" may be a TilesetCache shared between maps.
+    "tiledmap" may be a TiledMap already parsed from filename, such as one
+    parsed on another thread; then only its images are loaded.
+
+    the blit format of every tile is chosen by classify_tile.  compiled maps
+    made by the prebuild command already hold the formats, so they are only
+    worked out when the map is not compiled.
+    tmxdata.formats holds the format of each gid.
+    if "cache_dir" is given, the parsed map is read from the compiled map
+    cache in that directory when it is up to date.  the cache is never
+    written here.
     """
-    tmxdata = pytmx.TiledMap(filename)
+    tmxdata = kwargs.get("tiledmap")
+    if tmxdata is None:
+        tmxdata = compiled.load_map(filename, kwargs.get("source"), kwargs.get("cache_dir"))
     _load_images_pygame(tmxdata, None, *args, **kwargs)
     return tmxdata
 
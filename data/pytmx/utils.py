@@ -158,14 +158,6 @@ def buildDistributionRects(tmxmap, layer, tileset=None, real_gid=None):
 
 def simplify(all_points, tilewidth, tileheight):
     """
-    kludge:
-
-    "A kludge (or kluge) is a workaround, a quick-and-dirty solution,
-    a clumsy or inelegant, yet effective, solution to a problem, typically
-    using parts that are cobbled together."
-
-    -- wikipedia
-
     turn a list of points into a rects
     adjacent rects will be combined.
 
@@ -192,53 +184,53 @@ def simplify(all_points, tilewidth, tileheight):
         ..............
         ....##########
 
-        pretty cool, right?
-
-    there may be cases where the number of rectangles is not as low as possible,
-    but I haven't found that it is excessively bad.  certainly much better than
-    making a list of rects, one for each tile on the map!
-
+    points are taken in row order.  each one that is not covered yet
+    starts a rect, which grows right as far as the row allows and then
+    down while the whole width of the next row is free.  this is greedy
+    meshing: it is not always the fewest rects possible, but it never
+    recurses and runs in time proportional to the number of points.
     """
 
-    def pick_rect(points, rects):
-        ox, oy = sorted([ (sum(p), p) for p in points ])[0][1]
-        x = ox
-        y = oy
-        ex = None
+    remaining = set(all_points)
+    rects = []
 
-        while 1:
-            x += 1
-            if not (x, y) in points:
-                if ex is None:
-                    ex = x - 1
+    for ox, oy in sorted(remaining, key=lambda p: (p[1], p[0])):
+        if (ox, oy) not in remaining:
+            continue
 
-                if ((ox, y+1) in points):
-                    if x == ex + 1 :
-                        y += 1
-                        x = ox
+        ex = ox
+        while (ex + 1, oy) in remaining:
+            ex += 1
 
-                    else:
-                        y -= 1
-                        break
-                else:
-                    if x <= ex: y-= 1
-                    break
+        ey = oy
+        while all((x, ey + 1) in remaining for x in xrange(ox, ex + 1)):
+            ey += 1
 
-        c_rect = Rect(ox*tilewidth,oy*tileheight,\
-                     (ex-ox+1)*tilewidth,(y-oy+1)*tileheight)
+        for y in xrange(oy, ey + 1):
+            for x in xrange(ox, ex + 1):
+                remaining.discard((x, y))
 
-        rects.append(c_rect)
+        rects.append(Rect(ox * tilewidth, oy * tileheight,
+                          (ex - ox + 1) * tilewidth, (ey - oy + 1) * tileheight))
 
-        rect = Rect(ox,oy,ex-ox+1,y-oy+1)
-        kill = [ p for p in points if rect.collidepoint(p) ]
-        [ points.remove(i) for i in kill ]
-
-        if points:
-            pick_rect(points, rects)
+    return rects
 
-    rect_list = []
-    while all_points:
-        pick_rect(all_points, rect_list)
 
-    return rect_list
+def merge_rects(rects, width, height):
+    """
+    merge rects of size width x height that sit on a grid of that size,
+    such as one rect per blocker tile, into as few rects as simplify can
+    make.  rects of any other size or position are returned unchanged.
+    """
 
+    cells = set()
+    others = []
+    for rect in rects:
+        rect = Rect(rect)
+        if (rect.size == (width, height)
+                and rect.x % width == 0 and rect.y % height == 0):
+            cells.add((rect.x // width, rect.y // height))
+        else:
+            others.append(rect)
+
+    return simplify(cells, width, height) + others
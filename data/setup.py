@@ -7,7 +7,7 @@ creates dictionaries of resources.
 
 import os
 import pygame as pg
-from . import tools
+from . import tools, assets, atlas, bundle, cache, fade, music, profiler, pytmx, text
 from . import constants as c
 
 GAME = 'BEGIN GAME'
@@ -15,19 +15,43 @@ GAME = 'BEGIN GAME'
 ORIGINAL_CAPTION = 'The Stolen Crown'
 
 os.environ['SDL_VIDEO_CENTERED'] = '1'
-pg.init()
+profiler.call('pg.init', pg.init)
 pg.event.set_allowed([pg.KEYDOWN, pg.KEYUP, pg.QUIT])
 pg.display.set_caption(ORIGINAL_CAPTION)
-SCREEN = pg.display.set_mode((800, 608))
+SCREEN = profiler.call('set_mode', pg.display.set_mode, (800, 608))
 SCREEN_RECT = SCREEN.get_rect()
 
-FONTS = tools.load_all_fonts(os.path.join('resources', 'fonts'))
-MUSIC = tools.load_all_music(os.path.join('resources', 'music'))
-GFX = tools.load_all_gfx(os.path.join('resources', 'graphics'))
-SFX = tools.load_all_sfx(os.path.join('resources', 'sound'))
-TMX = tools.load_all_tmx(os.path.join('resources', 'tmx'))
-
-FONT = pg.font.Font(FONTS['Fixedsys500c'], 20)
+BUNDLE = profiler.call('load_bundle', bundle.load_bundle,
+                       c.BUNDLE_PATH, 'resources')
+if BUNDLE:
+    load_gfx, load_sfx = BUNDLE.load_gfx, BUNDLE.load_sfx
+else:
+    load_gfx, load_sfx = tools.load_gfx, tools.load_sfx
+
+with profiler.phase('asset registries'):
+    FONTS = assets.AssetRegistry(os.path.join('resources', 'fonts'), ('.ttf',))
+    MUSIC = tools.load_all_music(os.path.join('resources', 'music'))
+    GFX = assets.AssetRegistry(os.path.join('resources', 'graphics'),
+                               ('.png', '.jpg', '.bmp'),
+                               load_gfx,
+                               c.GFX_CACHE_SIZE)
+    SFX = assets.AssetRegistry(os.path.join('resources', 'sound'),
+                               ('.wav', '.mp3', '.ogg', '.mdi'),
+                               load_sfx,
+                               c.SFX_CACHE_SIZE)
+    TMX = tools.load_all_tmx(os.path.join('resources', 'tmx'))
+MUSIC_PLAYER = music.MusicPlayer(c.MUSIC_CACHE_SIZE, c.MUSIC_FADE_TIME)
+ATLAS = atlas.AtlasSet(c.ATLAS_PAGE_SIZE)
+TILESETS = pytmx.TilesetCache()
+FRAMES = tools.FrameCache(GFX, ATLAS)
+MAP_CACHE = cache.LRUCache(c.MAP_CACHE_SIZE, cache.surface_bytes)
+MAP_CHUNKS = cache.LRUCache(c.MAP_CHUNK_CACHE_SIZE, cache.surface_bytes)
+UI = atlas.AtlasImages(GFX, ATLAS)
+
+FONT_POOL = text.FontPool(FONTS)
+FONT = FONT_POOL.get('Fixedsys500c', 20)
+TEXT = text.TextCache(c.TEXT_CACHE_SIZE)
+FADE = fade.FadeOverlays(SCREEN_RECT.size)
 
 
 
@@ -31,7 +31,7 @@ class Gui(object):
         self.no_selling = ['Inn', 'magic shop']
         self.weapon_list = ['Long Sword', 'Rapier']
         self.armor_list = ['Chain Mail', 'Wooden Shield']
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.index = 0
         self.timer = 0.0
         self.allow_input = False
@@ -52,6 +52,7 @@ class Gui(object):
         self.two_arrow_pos_list = [self.arrow_pos4, self.arrow_pos5]
         self.arrow_index = 0
         self.selection_arrow.rect.topleft = self.arrow_pos1
+        self.boxes = {}
         self.dialogue_box = self.make_dialogue_box(self.dialogue, self.index)
         self.gold_box = self.make_gold_box()
         if self.name in self.no_selling:
@@ -70,22 +71,30 @@ class Gui(object):
 
     def make_dialogue_box(self, dialogue_list, index):
         """
-        Make the sprite that controls the dialogue.
+        Make the sprite that controls the dialogue.  Boxes are kept and
+        reused while their contents stay the same, so unchanged boxes
+        are not pushed to the display again.
         """
-        image = setup.GFX['dialoguebox']
+        key = 'dialogue', dialogue_list[index], self.index < len(self.dialogue) - 1
+        if key in self.boxes:
+            return self.boxes[key]
+
+        image = setup.UI['dialoguebox']
         rect = image.get_rect()
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, rect)
-        dialogue = self.font.render(dialogue_list[index],
-                                    True,
-                                    c.NEAR_BLACK)
+        image.draw(surface, rect)
+        dialogue = setup.TEXT.render(self.font,
+                                     dialogue_list[index],
+                                     True,
+                                     c.NEAR_BLACK)
         dialogue_rect = dialogue.get_rect(left=50, top=50)
         surface.blit(dialogue, dialogue_rect)
         sprite = pg.sprite.Sprite()
         sprite.image = surface
         sprite.rect = rect
         self.check_to_draw_arrow(sprite)
+        self.boxes[key] = sprite
 
         return sprite
 
@@ -98,15 +107,19 @@ class Gui(object):
 
     def make_gold_box(self):
         """Make the box to display total gold"""
-        image = setup.GFX['goldbox']
+        gold = self.player_inventory['GOLD']['quantity']
+        key = 'gold', gold
+        if key in self.boxes:
+            return self.boxes[key]
+
+        image = setup.UI['goldbox']
         rect = image.get_rect(bottom=608, right=800)
 
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
-        gold = self.player_inventory['GOLD']['quantity']
+        image.draw(surface, (0, 0))
         text = 'Gold: ' + str(gold)
-        text_render = self.font.render(text, True, c.NEAR_BLACK)
+        text_render = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK)
         text_rect = text_render.get_rect(x=80, y=60)
 
         surface.blit(text_render, text_rect)
@@ -114,33 +127,38 @@ class Gui(object):
         sprite = pg.sprite.Sprite()
         sprite.image = surface
         sprite.rect = rect
+        self.boxes[key] = sprite
 
         return sprite
 
     def make_selection_box(self, choices):
         """Make the box for the player to select options"""
-        image = setup.GFX['shopbox']
+        key = 'selection', tuple(choices)
+        if key in self.boxes:
+            return self.boxes[key]
+
+        image = setup.UI['shopbox']
         rect = image.get_rect(bottom=608)
 
         surface = pg.Surface(rect.size)
         surface.set_colorkey(c.BLACK)
-        surface.blit(image, (0, 0))
+        image.draw(surface, (0, 0))
 
         if len(choices) == 2:
-            choice1 = self.font.render(choices[0], True, c.NEAR_BLACK)
+            choice1 = setup.TEXT.render(self.font, choices[0], True, c.NEAR_BLACK)
             choice1_rect = choice1.get_rect(x=200, y=35)
-            choice2 = self.font.render(choices[1], True, c.NEAR_BLACK)
+            choice2 = setup.TEXT.render(self.font, choices[1], True, c.NEAR_BLACK)
             choice2_rect = choice2.get_rect(x=200, y=75)
 
             surface.blit(choice1, choice1_rect)
             surface.blit(choice2, choice2_rect)
 
         elif len(choices) == 3:
-            choice1 = self.font.render(choices[0], True, c.NEAR_BLACK)
+            choice1 = setup.TEXT.render(self.font, choices[0], True, c.NEAR_BLACK)
             choice1_rect = choice1.get_rect(x=200, y=15)
-            choice2 = self.font.render(choices[1], True, c.NEAR_BLACK)
+            choice2 = setup.TEXT.render(self.font, choices[1], True, c.NEAR_BLACK)
             choice2_rect = choice2.get_rect(x=200, y=55)
-            choice3 = self.font.render(choices[2], True, c.NEAR_BLACK)
+            choice3 = setup.TEXT.render(self.font, choices[2], True, c.NEAR_BLACK)
             choice3_rect = choice3.get_rect(x=200, y=95)
 
             surface.blit(choice1, choice1_rect)
@@ -150,6 +168,7 @@ class Gui(object):
         sprite = pg.sprite.Sprite()
         sprite.image = surface
         sprite.rect = rect
+        self.boxes[key] = sprite
 
         return sprite
 
@@ -20,6 +20,15 @@ class Battle(tools._State):
         self.music = setup.MUSIC['high_action']
         self.volume = 0.4
 
+    def predict_music(self):
+        """
+        Winning plays the victory theme, then the level's music resumes.
+        """
+        music = [setup.MUSIC['enchanted_festival']]
+        if self.previous_music in setup.MUSIC:
+            music.append(setup.MUSIC[self.previous_music])
+        return music
+
     def startup(self, current_time, game_data):
         """
         Initialize state attributes.
@@ -161,7 +170,7 @@ class Battle(tools._State):
 
         for i, enemy in enumerate(enemy_group):
             enemy.rect.topleft = pos_list[i]
-            enemy.image = pg.transform.scale2x(enemy.image)
+            enemy.image = setup.FRAMES.scale2x(enemy.image)
             enemy.index = i
             enemy.level = self.make_enemy_level_dict()[self.previous]
             if enemy.name == 'evilwizard':
@@ -178,7 +187,7 @@ class Battle(tools._State):
         Make the sprite for the player's character.
         """
         player = person.Player('left', self.game_data, 630, 220, 'battle resting', 1)
-        player.image = pg.transform.scale2x(player.image)
+        player.image = setup.FRAMES.scale2x(player.image)
         return player
 
     def make_selection_state_dict(self):
@@ -190,7 +199,7 @@ class Battle(tools._State):
                       self.enter_select_magic_state, self.try_to_run_away]
         return dict(izip(pos_list, state_list))
 
-    def update(self, surface, keys, current_time):
+    def update(self, keys, current_time):
         """
         Update the battle state.
         """
@@ -206,7 +215,9 @@ class Battle(tools._State):
         self.sword.update(current_time)
         self.damage_points.update()
         self.execute_player_actions()
+        self.update_transition()
 
+    def draw(self, surface):
         self.draw_battle(surface)
 
     def check_input(self, keys):
@@ -420,34 +431,29 @@ class Battle(tools._State):
         self.draw_transition(surface)
 
     def draw_transition(self, surface):
+        """
+        Draw the fade while fading in or out of state.
+        """
+        if self.state in ('transition in', 'transition out', c.DEATH_FADE):
+            setup.FADE.draw(surface, c.TRANSITION_COLOR,
+                             self.transition_alpha, self.transition_rect)
+
+    def update_transition(self):
         """
         Fade in and out of state.
         """
         if self.state == 'transition in':
-
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
             self.transition_alpha -= c.TRANSITION_SPEED 
             if self.transition_alpha <= 0:
                 self.state = c.SELECT_ACTION
                 self.transition_alpha = 0
 
         elif self.state == 'transition out':
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
             self.transition_alpha += c.TRANSITION_SPEED 
             if self.transition_alpha >= 255:
                 self.done = True
 
         elif self.state == c.DEATH_FADE:
-            transition_image = pg.Surface(self.transition_rect.size)
-            transition_image.fill(c.TRANSITION_COLOR)
-            transition_image.set_alpha(self.transition_alpha)
-            surface.blit(transition_image, self.transition_rect)
             self.transition_alpha += c.DEATH_TRANSITION_SPEED
             if self.transition_alpha >= 255:
                 self.done = True
@@ -10,7 +10,7 @@ class CreditEntry(object):
     """
     def __init__(self, level):
         self.alpha = 0
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.credit_sprites = self.make_credits()
         self.index = 0
         self.current_credit = self.credit_sprites[self.index]
@@ -57,12 +57,13 @@ class CreditEntry(object):
             subcredit_list = []
             for i, subcredit in enumerate(credit):
                 text_sprite = pg.sprite.Sprite()
-                text_sprite.text_image = self.font.render(subcredit, True, c.WHITE)
+                text_sprite.text_image = setup.TEXT.render(self.font, subcredit, True, c.WHITE)
                 text_sprite.rect = text_sprite.text_image.get_rect(centerx = 400,
                                                                    y=100+(i*40))
                 text_sprite.image = pg.Surface(text_sprite.rect.size).convert()
                 text_sprite.image.set_colorkey(c.BLACK)
                 text_sprite.image.set_alpha(self.alpha)
+                text_sprite.image.blit(text_sprite.text_image, (0, 0))
                 subcredit_list.append(text_sprite)
             credit_sprites.append(subcredit_list)
         
@@ -80,10 +81,7 @@ class CreditEntry(object):
 
     def transition_in(self):
         for credit in self.current_credit:
-            credit.image = pg.Surface(credit.rect.size).convert()
-            credit.image.set_colorkey(c.BLACK)
             credit.image.set_alpha(self.alpha)
-            credit.image.blit(credit.text_image, (0, 0))
 
         self.alpha += 5
         if self.alpha >= 255:
@@ -93,10 +91,7 @@ class CreditEntry(object):
 
     def transition_out(self):
         for credit in self.current_credit:
-            credit.image = pg.Surface(credit.rect.size).convert()
-            credit.image.set_colorkey(c.BLACK)
             credit.image.set_alpha(self.alpha)
-            credit.image.blit(credit.text_image, (0, 0))
            
         self.alpha -= 5
         if self.alpha <= 0:
@@ -151,11 +146,13 @@ class Credits(tools._State):
         self.background.fill(c.BLACK_BLUE)
         self.credit = CreditEntry(self)
 
-    def update(self, surface, keys, current_time):
+    def update(self, keys, current_time):
         """
         Update scene.
         """
         self.credit.update(current_time)
+
+    def draw(self, surface):
         self.draw_scene(surface)
 
     def draw_scene(self, surface):
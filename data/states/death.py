@@ -17,7 +17,7 @@ class Arrow(pg.sprite.Sprite):
     """
     def __init__(self, x, y):
         super(Arrow, self).__init__()
-        self.image = setup.GFX['smallarrow']
+        self.image = setup.UI['smallarrow'].image
         self.rect = self.image.get_rect(x=x,
                                         y=y)
         self.index = 0
@@ -65,11 +65,11 @@ class DeathScene(tools._State):
 
     def startup(self, current_time, game_data):
         self.game_data = game_data
-        self.font = pg.font.Font(setup.FONTS[c.MAIN_FONT], 22)
+        self.font = setup.FONT_POOL.get(c.MAIN_FONT, 22)
         self.background = pg.Surface(setup.SCREEN_RECT.size)
         self.background.fill(c.BLACK_BLUE)
         self.player = person.Player('down', self.game_data, 1, 1, 'resting', 1)
-        self.player.image = pg.transform.scale2x(self.player.image)
+        self.player.image = setup.FRAMES.scale2x(self.player.image)
         self.player.rect = self.player.image.get_rect()
         self.player.rect.center = setup.SCREEN_RECT.center
         self.message_box = self.make_message_box()
@@ -78,9 +78,7 @@ class DeathScene(tools._State):
         self.state = c.TRANSITION_IN
         self.alpha = 255
         self.name = c.DEATH_SCENE
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         if not os.path.isfile("save.p"):
             game_data = tools.create_game_data_dict()
             pickle.dump(game_data, open("save.p", "wb"))
@@ -97,25 +95,25 @@ class DeathScene(tools._State):
         """
         Make the text box informing of death.
         """
-        box_image = setup.GFX['dialoguebox']
+        box_image = setup.UI['dialoguebox']
         box_rect = box_image.get_rect()
         text = 'You have died. Restart from last save point?'
-        text_render = self.font.render(text, True, c.NEAR_BLACK) 
+        text_render = setup.TEXT.render(self.font, text, True, c.NEAR_BLACK) 
         text_rect = text_render.get_rect(centerx=box_rect.centerx,
                                          y=30)
         text2 = 'Yes'
-        text2_render = self.font.render(text2, True, c.NEAR_BLACK)
+        text2_render = setup.TEXT.render(self.font, text2, True, c.NEAR_BLACK)
         text2_rect = text2_render.get_rect(centerx=box_rect.centerx,
                                            y=70)
 
         text3 = 'No'
-        text3_render = self.font.render(text3, True, c.NEAR_BLACK)
+        text3_render = setup.TEXT.render(self.font, text3, True, c.NEAR_BLACK)
         text3_rect = text3_render.get_rect(centerx=box_rect.centerx,
                                            y=105)
 
         temp_surf = pg.Surface(box_rect.size)
         temp_surf.set_colorkey(c.BLACK)
-        temp_surf.blit(box_image, box_rect)
+        box_image.draw(temp_surf, box_rect)
         temp_surf.blit(text_render, text_rect)
         temp_surf.blit(text2_render, text2_rect)
         temp_surf.blit(text3_render, text3_rect)
@@ -136,19 +134,21 @@ class DeathScene(tools._State):
 
         return state_dict
 
-    def update(self, surface, keys, *args):
+    def update(self, keys, *args):
         """
         Update scene.
         """
         update_level = self.state_dict[self.state]
         update_level(keys)
+
+    def draw(self, surface):
         self.draw_level(surface)
 
     def transition_in(self, *args):
         """
         Transition into scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -158,11 +158,14 @@ class DeathScene(tools._State):
         """
         Transition out of scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
 
+    def is_idle(self):
+        return self.state == c.NORMAL
+
     def normal_update(self, keys):
         self.arrow.update(keys)
         self.check_for_input(keys)
@@ -189,7 +192,7 @@ class DeathScene(tools._State):
         surface.blit(self.player.image, self.player.rect)
         surface.blit(self.message_box.image, self.message_box.rect)
         surface.blit(self.arrow.image, self.arrow.rect)
-        surface.blit(self.transition_surface, (0, 0))
+        setup.FADE.draw(surface, c.BLACK_BLUE, self.fade_alpha)
 
 
 
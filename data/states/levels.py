@@ -11,7 +11,7 @@ from .. import tools, collision
 from .. import constants as c
 from .. components import person, textbox, portal
 from . import player_menu
-from .. import tilerender
+from .. import tilerender, pytmx, preload
 from .. import setup
 
 
@@ -20,6 +20,37 @@ if sys.version_info[0] == 2:
     range = xrange
 
 
+STATE_MUSIC = {c.TOWN: ('town_theme', .4),
+               c.OVERWORLD: ('overworld', .4),
+               c.CASTLE: ('town_theme', .4),
+               c.DUNGEON: ('dungeon_theme', .4),
+               c.DUNGEON2: ('dungeon_theme', .4),
+               c.DUNGEON3: ('dungeon_theme', .4),
+               c.DUNGEON4: ('dungeon_theme', .4),
+               c.DUNGEON5: ('dungeon_theme', .4),
+               c.HOUSE: ('pleasant_creek', .1),
+               c.BROTHER_HOUSE: ('pleasant_creek', .1),
+               c.INN: ('shop_theme', .4),
+               c.ARMOR_SHOP: ('shop_theme', .4),
+               c.WEAPON_SHOP: ('shop_theme', .4),
+               c.MAGIC_SHOP: ('shop_theme', .4),
+               c.POTION_SHOP: ('shop_theme', .4)}
+
+
+# prepares the levels the portals of the current level lead to
+PRELOADER = preload.LevelPreloader(setup.MAP_CHUNKS, c.MAP_CHUNK_SIZE,
+                                   c.SCREEN_SIZE)
+
+
+def level_music(name, game_data):
+    """
+    Return the music title and volume for the named state.
+    """
+    if game_data['crown quest'] and (name == c.TOWN or name == c.CASTLE):
+        return 'kings_theme', .4
+    return STATE_MUSIC.get(name, (None, None))
+
+
 class LevelState(tools._State):
     def __init__(self, name, battles=False):
         super(LevelState, self).__init__()
@@ -45,13 +76,15 @@ class LevelState(tools._State):
         self.use_portal = False
         self.allow_input = False
         self.cut_off_bottom_map = ['castle', 'town', 'dungeon']
-        self.renderer = tilerender.Renderer(self.tmx_map)
-        self.map_image = self.renderer.make_2x_map()
+        self.renderer = PRELOADER.take(self.tmx_map)
+        self.map_image = tilerender.ChunkedMap(self.renderer,
+                                               setup.MAP_CHUNKS,
+                                               c.MAP_CHUNK_SIZE)
 
         self.viewport = self.make_viewport(self.map_image)
-        self.level_surface = self.make_level_surface(self.map_image)
-        self.level_rect = self.level_surface.get_rect()
+        self.level_rect = self.make_level_rect(self.map_image)
         self.portals = self.make_level_portals()
+        PRELOADER.preload(self.neighbour_maps(), self.name, self.renderer)
         self.player = self.make_player()
         self.blockers = self.make_blockers()
         self.sprites = self.make_sprites()
@@ -66,33 +99,33 @@ class LevelState(tools._State):
         self.menu_screen = player_menu.Player_Menu(game_data, self)
         self.transition_rect = setup.SCREEN.get_rect()
         self.transition_alpha = 255
+        self.tracker = tools.DirtyTracker()
+        self.dirty = None
+        self.updated_state = self.state
+        self.drawn_view = None
 
     def set_music(self):
         """
         Set music based on name.
         """
-        music_dict = {c.TOWN: ('town_theme', .4),
-                      c.OVERWORLD: ('overworld', .4),
-                      c.CASTLE: ('town_theme', .4),
-                      c.DUNGEON: ('dungeon_theme', .4),
-                      c.DUNGEON2: ('dungeon_theme', .4),
-                      c.DUNGEON3: ('dungeon_theme', .4),
-                      c.DUNGEON4: ('dungeon_theme', .4),
-                      c.DUNGEON5: ('dungeon_theme', .4),
-                      c.HOUSE: ('pleasant_creek', .1),
-                      c.BROTHER_HOUSE: ('pleasant_creek', .1)}
-
-        if self.game_data['crown quest'] and (self.name == c.TOWN or self.name == c.CASTLE):
-            self.music_title = 'kings_theme'
-            return setup.MUSIC['kings_theme'], .4
-        elif self.name in music_dict:
-            music = music_dict[self.name][0]
-            volume = music_dict[self.name][1]
-            self.music_title = music
-            return setup.MUSIC[music], volume
+        self.music_title, volume = level_music(self.name, self.game_data)
+        if self.music_title:
+            return setup.MUSIC[self.music_title], volume
         else:
             return None, None
 
+    def predict_music(self):
+        """
+        The next track is either that of a portal's destination or,
+        in levels with random battles, the battle theme.
+        """
+        titles = set(level_music(each.name, self.game_data)[0]
+                     for each in self.portals)
+        if self.allow_battles:
+            titles.add('high_action')
+
+        return [setup.MUSIC[title] for title in titles if title in setup.MUSIC]
+
     def make_viewport(self, map_image):
         """
         Create the viewport to view the level through.
@@ -100,19 +133,15 @@ class LevelState(tools._State):
         map_rect = map_image.get_rect()
         return setup.SCREEN.get_rect(bottom=map_rect.bottom)
 
-    def make_level_surface(self, map_image):
+    def make_level_rect(self, map_image):
         """
-        Create the surface all images are blitted to.
+        Create the rect the viewport is kept inside.
         """
         map_rect = map_image.get_rect()
-        map_width = map_rect.width
         if self.name in self.cut_off_bottom_map:
-            map_height = map_rect.height - 32
-        else:
-            map_height = map_rect.height
-        size = map_width, map_height
+            map_rect.height -= 32
 
-        return pg.Surface(size).convert()
+        return map_rect
 
     def make_player(self):
         """
@@ -126,34 +155,34 @@ class LevelState(tools._State):
             player.rect.y = self.game_data['last location'][1] * 32
 
         else:
-            for object in self.renderer.tmx_data.getObjects():
+            tmx_data = self.renderer.tmx_data
+            for object in tmx_data.getObjectsByName('start point'):
                 properties = object.__dict__
-                if properties['name'] == 'start point':
-                    if last_state == properties['state']:
-                        posx = properties['x'] * 2
-                        posy = (properties['y'] * 2) - 32
-                        player = person.Player(properties['direction'],
-                                               self.game_data)
-                        player.rect.x = posx
-                        player.rect.y = posy
+                if last_state == properties['state']:
+                    posx = properties['x'] * 2
+                    posy = (properties['y'] * 2) - 32
+                    player = person.Player(properties['direction'],
+                                           self.game_data)
+                    player.rect.x = posx
+                    player.rect.y = posy
 
         return player
 
     def make_blockers(self):
         """
-        Make the blockers for the level.
+        Make the blockers for the level.  Neighbouring blocker tiles are
+        merged into larger rects, so there are fewer to collide with.
         """
         blockers = []
 
-        for object in self.renderer.tmx_data.getObjects():
+        for object in self.renderer.tmx_data.getObjectsByName('blocker'):
             properties = object.__dict__
-            if properties['name'] == 'blocker':
-                left = properties['x'] * 2
-                top = ((properties['y']) * 2) - 32
-                blocker = pg.Rect(left, top, 32, 32)
-                blockers.append(blocker)
+            left = properties['x'] * 2
+            top = ((properties['y']) * 2) - 32
+            blocker = pg.Rect(left, top, 32, 32)
+            blockers.append(blocker)
 
-        return blockers
+        return pytmx.merge_rects(blockers, 32, 32)
 
     def make_sprites(self):
         """
@@ -161,83 +190,82 @@ class LevelState(tools._State):
         """
         sprites = pg.sprite.Group()
 
-        for object in self.renderer.tmx_data.getObjects():
+        for object in self.renderer.tmx_data.getObjectsByName('sprite'):
             properties = object.__dict__
-            if properties['name'] == 'sprite':
-                if 'direction' in properties:
-                    direction = properties['direction']
-                else:
-                    direction = 'down'
-
-                if properties['type'] == 'soldier' and direction == 'left':
-                    index = 1
-                else:
-                    index = 0
-
-                if 'item' in properties:
-                    item = properties['item']
-                else:
-                    item = None
-
-                if 'id' in properties:
-                    id = properties['id']
-                else:
-                    id = None
-
-                if 'battle' in properties:
-                    battle = properties['battle']
-                else:
-                    battle = None
-
-                if 'state' in properties:
-                    sprite_state = properties['state']
-                else:
-                    sprite_state = None
-
-
-                x = properties['x'] * 2
-                y = ((properties['y']) * 2) - 32
-
-                sprite_dict = {'oldman': person.Person('oldman',
-                                                       x, y, direction),
-                               'bluedressgirl': person.Person('femalevillager',
-                                                              x, y, direction,
-                                                              'resting', 1),
-                               'femalewarrior': person.Person('femvillager2',
-                                                              x, y, direction,
-                                                              'autoresting'),
-                               'devil': person.Person('devil', x, y,
-                                                      'down', 'autoresting'),
-                               'oldmanbrother': person.Person('oldmanbrother',
-                                                              x, y, direction),
-                               'soldier': person.Person('soldier',
-                                                        x, y, direction,
-                                                        'resting', index),
-                               'king': person.Person('king', x, y, direction),
-                               'evilwizard': person.Person('evilwizard', x, y, direction),
-                               'treasurechest': person.Chest(x, y, id)}
-
-                sprite = sprite_dict[properties['type']]
-                if sprite_state:
-                    sprite.state = sprite_state
-
-                if sprite.name == 'oldman':
-                    if self.game_data['old man gift'] and not self.game_data['elixir received']:
-                        sprite.item = self.game_data['old man gift']
-                    else:
-                        sprite.item = item
-                elif sprite.name == 'king':
-                    if not self.game_data['talked to king']:
-                        sprite.item = self.game_data['king item']
+            if 'direction' in properties:
+                direction = properties['direction']
+            else:
+                direction = 'down'
+
+            if properties['type'] == 'soldier' and direction == 'left':
+                index = 1
+            else:
+                index = 0
+
+            if 'item' in properties:
+                item = properties['item']
+            else:
+                item = None
+
+            if 'id' in properties:
+                id = properties['id']
+            else:
+                id = None
+
+            if 'battle' in properties:
+                battle = properties['battle']
+            else:
+                battle = None
+
+            if 'state' in properties:
+                sprite_state = properties['state']
+            else:
+                sprite_state = None
+
+
+            x = properties['x'] * 2
+            y = ((properties['y']) * 2) - 32
+
+            sprite_dict = {'oldman': person.Person('oldman',
+                                                   x, y, direction),
+                           'bluedressgirl': person.Person('femalevillager',
+                                                          x, y, direction,
+                                                          'resting', 1),
+                           'femalewarrior': person.Person('femvillager2',
+                                                          x, y, direction,
+                                                          'autoresting'),
+                           'devil': person.Person('devil', x, y,
+                                                  'down', 'autoresting'),
+                           'oldmanbrother': person.Person('oldmanbrother',
+                                                          x, y, direction),
+                           'soldier': person.Person('soldier',
+                                                    x, y, direction,
+                                                    'resting', index),
+                           'king': person.Person('king', x, y, direction),
+                           'evilwizard': person.Person('evilwizard', x, y, direction),
+                           'treasurechest': person.Chest(x, y, id)}
+
+            sprite = sprite_dict[properties['type']]
+            if sprite_state:
+                sprite.state = sprite_state
+
+            if sprite.name == 'oldman':
+                if self.game_data['old man gift'] and not self.game_data['elixir received']:
+                    sprite.item = self.game_data['old man gift']
                 else:
                     sprite.item = item
-                sprite.battle = battle
-                self.assign_dialogue(sprite, properties)
-                self.check_for_opened_chest(sprite)
-                if sprite.name == 'evilwizard' and self.game_data['crown quest']:
-                    pass
-                else:
-                    sprites.add(sprite)
+            elif sprite.name == 'king':
+                if not self.game_data['talked to king']:
+                    sprite.item = self.game_data['king item']
+            else:
+                sprite.item = item
+            sprite.battle = battle
+            self.assign_dialogue(sprite, properties)
+            self.check_for_opened_chest(sprite)
+            if sprite.name == 'evilwizard' and self.game_data['crown quest']:
+                pass
+            else:
+                sprites.add(sprite)
 
         return sprites
 
@@ -323,18 +351,24 @@ class LevelState(tools._State):
         """
         portal_group = pg.sprite.Group()
 
-        for object in self.renderer.tmx_data.getObjects():
+        for object in self.renderer.tmx_data.getObjectsByName('portal'):
             properties = object.__dict__
-            if properties['name'] == 'portal':
-                posx = properties['x'] * 2
-                posy = (properties['y'] * 2) - 32
-                new_state = properties['type']
-                portal_group.add(portal.Portal(posx, posy, new_state))
+            posx = properties['x'] * 2
+            posy = (properties['y'] * 2) - 32
+            new_state = properties['type']
+            portal_group.add(portal.Portal(posx, posy, new_state))
 
 
         return portal_group
 
-    def running_normally(self, surface, keys, current_time):
+    def neighbour_maps(self):
+        """
+        Return the {state name: tmx file} of the levels the portals lead to.
+        """
+        return dict((each.name, setup.TMX[each.name])
+                    for each in self.portals if each.name in setup.TMX)
+
+    def running_normally(self, keys, current_time):
         """
         Update level normally.
         """
@@ -348,7 +382,6 @@ class LevelState(tools._State):
         self.dialogue_handler.update(keys, current_time)
         self.check_for_menu(keys)
         self.viewport_update()
-        self.draw_level(surface)
 
     def check_for_portals(self):
         """
@@ -419,19 +452,17 @@ class LevelState(tools._State):
         elif direction == 'right':
             location[0] -= 1
 
-    def handling_dialogue(self, surface, keys, current_time):
+    def handling_dialogue(self, keys, current_time):
         """
         Update only dialogue boxes.
         """
         self.dialogue_handler.update(keys, current_time)
-        self.draw_level(surface)
 
-    def goto_menu(self, surface, keys, *args):
+    def goto_menu(self, keys, *args):
         """
         Go to menu screen.
         """
-        self.menu_screen.update(surface, keys)
-        self.menu_screen.draw(surface)
+        self.menu_screen.update(keys)
 
     def check_for_dialogue(self):
         """
@@ -440,55 +471,72 @@ class LevelState(tools._State):
         if self.dialogue_handler.textbox:
             self.state = 'dialogue'
 
-    def transition_out(self, surface, *args):
+    def transition_out(self, *args):
         """
         Transition level to new scene.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
-        self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
         self.transition_alpha += c.TRANSITION_SPEED
         if self.transition_alpha >= 255:
             self.transition_alpha = 255
             self.done = True
 
-    def slow_fade_out(self, surface, *args):
+    def slow_fade_out(self, *args):
         """
         Transition level to new scene.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
-        self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
         self.transition_alpha += 2
         if self.transition_alpha >= 255:
             self.transition_alpha = 255
             self.done = True
 
-    def transition_in(self, surface, *args):
+    def transition_in(self, *args):
         """
         Transition into level.
         """
         self.viewport_update()
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
-        self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
         self.transition_alpha -= c.TRANSITION_SPEED 
         if self.transition_alpha <= 0:
             self.state = 'normal'
             self.transition_alpha = 0
 
-    def update(self, surface, keys, current_time):
+    def update(self, keys, current_time):
         """
         Update state.
         """
+        PRELOADER.update()
+        self.updated_state = self.state
         state_function = self.state_dict[self.state]
-        state_function(surface, keys, current_time)
+        state_function(keys, current_time)
+
+    def draw(self, surface):
+        """
+        Draw what the last update worked on: the level, faded while
+        transitioning, or the player menu.
+        """
+        state = self.updated_state
+        if state == 'menu':
+            self.menu_screen.draw(surface)
+        else:
+            self.draw_level(surface)
+            if state not in ('normal', 'dialogue'):
+                setup.FADE.draw(surface, c.TRANSITION_COLOR,
+                                 self.transition_alpha, self.transition_rect)
+
+        # only draw_level draws while running normally or in dialogue
+        still = (state in ('normal', 'dialogue')
+                 and self.viewport.topleft == self.drawn_view)
+        self.drawn_view = self.viewport.topleft
+        self.dirty = self.tracker.finish(still)
+
+    def dirty_rects(self):
+        return self.dirty
+
+    def is_idle(self):
+        """
+        Nothing moves while a dialogue box or the player menu is up,
+        once the preloader has finished its work.
+        """
+        return self.state in ('dialogue', 'menu') and not PRELOADER.is_busy()
 
     def viewport_update(self):
         """
@@ -502,12 +550,17 @@ class LevelState(tools._State):
         """
         Blit all images to screen.
         """
-        self.level_surface.blit(self.map_image, self.viewport, self.viewport)
-        self.level_surface.blit(self.player.image, self.player.rect)
-        self.sprites.draw(self.level_surface)
+        offset = -self.viewport.x, -self.viewport.y
+        blit = self.tracker.blit
+
+        self.map_image.draw(surface, self.viewport)
+        blit(surface, self.player.image, self.player.rect.move(offset))
+        for sprite in self.sprites:
+            blit(surface, sprite.image, sprite.rect.move(offset))
 
-        surface.blit(self.level_surface, (0, 0), self.viewport)
-        self.dialogue_handler.draw(surface)
+        textbox = self.dialogue_handler.textbox
+        if textbox:
+            blit(surface, textbox.image, textbox.rect)
 
 
 
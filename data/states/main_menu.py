@@ -29,16 +29,14 @@ class Menu(tools._State):
         self.map_rect = self.map_image.get_rect()
         self.viewport = self.make_viewport(self.map_image)
         self.level_surface = pg.Surface(self.map_rect.size)
-        self.title_box = setup.GFX['title_box']
+        self.title_box = setup.UI['title_box']
         self.title_rect = self.title_box.get_rect()
         self.title_rect.midbottom = self.viewport.midbottom
         self.title_rect.y -= 30
         self.state_dict = self.make_state_dict()
         self.state = c.TRANSITION_IN
         self.alpha = 255
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
 
     def make_viewport(self, map_image):
         """
@@ -57,12 +55,14 @@ class Menu(tools._State):
 
         return state_dict
         
-    def update(self, surface, *args):
+    def update(self, *args):
         """
         Update scene.
         """
         update_level = self.state_dict[self.state]
         update_level()
+
+    def draw(self, surface):
         self.draw_level(surface)
 
     def draw_level(self, surface):
@@ -70,19 +70,22 @@ class Menu(tools._State):
         Blit tmx map and title box onto screen.
         """
         self.level_surface.blit(self.map_image, self.viewport, self.viewport)
-        self.level_surface.blit(self.title_box, self.title_rect)
+        self.title_box.draw(self.level_surface, self.title_rect)
         surface.blit(self.level_surface, (0,0), self.viewport)
-        surface.blit(self.transition_surface, (0,0))
+        setup.FADE.draw(surface, c.BLACK_BLUE, self.fade_alpha)
         
     def get_event(self, event):
         if event.type == pg.KEYDOWN:
             self.state = c.TRANSITION_OUT
 
+    def is_idle(self):
+        return self.state == c.NORMAL
+
     def transition_in(self):
         """
         Transition into scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -93,7 +96,7 @@ class Menu(tools._State):
         """
         Transition out of scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
@@ -128,9 +131,7 @@ class Instructions(tools._State):
         self.name = c.MAIN_MENU
         self.state = c.TRANSITION_IN
         self.alpha = 255
-        self.transition_surface = pg.Surface(setup.SCREEN_RECT.size)
-        self.transition_surface.fill(c.BLACK_BLUE)
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.observers = [observer.SoundEffects()]
 
     def notify(self, event):
@@ -156,7 +157,7 @@ class Instructions(tools._State):
         """
         Set image for message box.
         """
-        return setup.GFX['instructions_box']
+        return setup.UI['instructions_box']
 
     def make_viewport(self, map_image):
         """
@@ -175,12 +176,14 @@ class Instructions(tools._State):
 
         return state_dict
         
-    def update(self, surface, keys, *args):
+    def update(self, keys, *args):
         """
         Update scene.
         """
         update_level = self.state_dict[self.state]
         update_level(keys)
+
+    def draw(self, surface):
         self.draw_level(surface)
 
     def draw_level(self, surface):
@@ -188,10 +191,10 @@ class Instructions(tools._State):
         Blit tmx map and title box onto screen.
         """
         self.level_surface.blit(self.map_image, self.viewport, self.viewport)
-        self.level_surface.blit(self.title_box, self.title_rect)
+        self.title_box.draw(self.level_surface, self.title_rect)
         self.draw_arrow()
         surface.blit(self.level_surface, (0,0), self.viewport)
-        surface.blit(self.transition_surface, (0,0))
+        setup.FADE.draw(surface, c.BLACK_BLUE, self.fade_alpha)
 
     def draw_arrow(self):
         pass
@@ -200,11 +203,14 @@ class Instructions(tools._State):
         if event.type == pg.KEYDOWN:
             self.state = c.TRANSITION_OUT
 
+    def is_idle(self):
+        return self.state == c.NORMAL
+
     def transition_in(self, *args):
         """
         Transition into scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha -= c.TRANSITION_SPEED
         if self.alpha <= 0:
             self.alpha = 0
@@ -214,7 +220,7 @@ class Instructions(tools._State):
         """
         Transition out of scene with a fade.
         """
-        self.transition_surface.set_alpha(self.alpha)
+        self.fade_alpha = self.alpha
         self.alpha += c.TRANSITION_SPEED
         if self.alpha >= 255:
             self.done = True
@@ -234,7 +240,7 @@ class LoadGame(Instructions):
         """
         Set image for message box.
         """
-        return setup.GFX['loadgamebox']
+        return setup.UI['loadgamebox']
 
     def draw_arrow(self):
         self.level_surface.blit(self.arrow.image, self.arrow.rect)
@@ -12,7 +12,7 @@ class Player_Menu(object):
     def __init__(self, game_data, level):
         inventory = game_data['player inventory']
         stats = game_data['player stats']
-        self.get_image = tools.get_image
+        self.get_frame = setup.FRAMES.get
         self.allow_input = False
         self.background = self.make_background()
         self.gui = menugui.MenuGui(level, inventory, stats)
@@ -37,14 +37,7 @@ class Player_Menu(object):
         """
         Get the image for the player.
         """
-        spritesheet = setup.GFX[key]
-        surface = pg.Surface((32, 32))
-        surface.set_colorkey(c.BLACK)
-        image = self.get_image(coordx, coordy, 32, 32, spritesheet)
-        rect = image.get_rect()
-        surface.blit(image, rect)
-
-        surface = pg.transform.scale(surface, (192, 192))
+        surface = self.get_frame(key, coordx, coordy, 32, 32, 6)
         rect = surface.get_rect(left=x, top=y)
         sprite = pg.sprite.Sprite()
         sprite.image = surface
@@ -52,9 +45,8 @@ class Player_Menu(object):
 
         return sprite
 
-    def update(self, surface, keys):
+    def update(self, keys):
         self.gui.update(keys)
-        self.draw(surface)
 
     def draw(self, surface):
         surface.blit(self.background.image, self.background.rect)
@@ -6,7 +6,6 @@ twice as big as a level state. The self.gui controls
 all the textboxes.
 """
 
-import copy
 import pygame as pg
 from .. import tools, setup, shopgui
 from .. import constants as c
@@ -28,7 +27,7 @@ class Shop(tools._State):
         self.state_dict = self.make_state_dict()
         self.state = 'transition in'
         self.next = c.TOWN
-        self.get_image = tools.get_image
+        self.get_frame = setup.FRAMES.get
         self.dialogue = self.make_dialogue()
         self.accept_dialogue = self.make_accept_dialogue()
         self.accept_sale_dialogue = self.make_accept_sale_dialogue()
@@ -37,6 +36,8 @@ class Shop(tools._State):
         self.gui = shopgui.Gui(self)
         self.transition_rect = setup.SCREEN.get_rect()
         self.transition_alpha = 255
+        self.tracker = tools.DirtyTracker()
+        self.dirty = None
 
     def make_state_dict(self):
         """
@@ -96,14 +97,7 @@ class Shop(tools._State):
         """
         Get the image for the player.
         """
-        spritesheet = setup.GFX[key]
-        surface = pg.Surface((32, 32))
-        surface.set_colorkey(c.BLACK)
-        image = self.get_image(coordx, coordy, 32, 32, spritesheet)
-        rect = image.get_rect()
-        surface.blit(image, rect)
-
-        surface = pg.transform.scale(surface, (96, 96))
+        surface = self.get_frame(key, coordx, coordy, 32, 32, 3)
         rect = surface.get_rect(left=x, centery=y)
         sprite = pg.sprite.Sprite()
         sprite.image = surface
@@ -115,51 +109,54 @@ class Shop(tools._State):
         """
         Make the counter to conduct business.
         """
-        sprite_sheet = copy.copy(setup.GFX['house'])
         sprite = pg.sprite.Sprite()
-        sprite.image = self.get_image(102, 64, 26, 82, sprite_sheet)
-        sprite.image = pg.transform.scale2x(sprite.image)
+        sprite.image = self.get_frame('house', 102, 64, 26, 82, 2, tools.SCALE2X)
         sprite.rect = sprite.image.get_rect(left=550, top=225)
 
         return sprite
 
-    def update(self, surface, keys, current_time):
+    def update(self, keys, current_time):
         """
         Update scene.
         """
         state_function = self.state_dict[self.state]
-        state_function(surface, keys, current_time)
+        state_function(keys, current_time)
+
+    def draw(self, surface):
+        """
+        Draw the shop, faded while transitioning in or out.
+        """
+        self.draw_level(surface)
+        if self.state != 'normal':
+            setup.FADE.draw(surface, c.TRANSITION_COLOR,
+                             self.transition_alpha, self.transition_rect)
+        self.dirty = self.tracker.finish(self.state == 'normal')
 
-    def normal_update(self, surface, keys, current_time):
+    def dirty_rects(self):
+        return self.dirty
+
+    def is_idle(self):
+        return self.state == 'normal'
+
+    def normal_update(self, keys, current_time):
         """
         Update level normally.
         """
         self.gui.update(keys, current_time)
-        self.draw_level(surface)
 
-    def transition_in(self, surface, *args):
+    def transition_in(self, *args):
         """
         Transition into level.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
-        self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
         self.transition_alpha -= c.TRANSITION_SPEED 
         if self.transition_alpha <= 0:
             self.state = 'normal'
             self.transition_alpha = 0
 
-    def transition_out(self, surface, *args):
+    def transition_out(self, *args):
         """
         Transition level to new scene.
         """
-        transition_image = pg.Surface(self.transition_rect.size)
-        transition_image.fill(c.TRANSITION_COLOR)
-        transition_image.set_alpha(self.transition_alpha)
-        self.draw_level(surface)
-        surface.blit(transition_image, self.transition_rect)
         self.transition_alpha += c.TRANSITION_SPEED 
         if self.transition_alpha >= 255:
             self.done = True
@@ -169,7 +166,7 @@ class Shop(tools._State):
         Blit graphics to game surface.
         """
         surface.blit(self.background.image, self.background.rect)
-        self.gui.draw(surface)
+        self.gui.draw(self.tracker.wrap(surface))
 
 
 class Inn(Shop):
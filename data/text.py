@@ -0,0 +1,80 @@
+"""
+Shared font objects and rendered text.  Opening a Font reads and parses
+the whole TTF file, so every part of the game asks setup.FONT_POOL for
+its fonts instead of constructing its own.  Likewise labels are drawn
+through setup.TEXT, which renders each distinct string once.
+"""
+import pygame as pg
+from . import cache
+
+
+class FontPool(object):
+    """
+    Cache of Font objects keyed by (face, size, underline, bold, italic).
+    Fonts are shared, so their style must not be changed after they are
+    handed out; ask for a styled font instead.
+    """
+    def __init__(self, faces):
+        self.faces = faces
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, face, size, underline=False, bold=False, italic=False):
+        """
+        Return the font for face at size with the given style.
+        """
+        key = face, size, underline, bold, italic
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        font = pg.font.Font(self.faces[face], size)
+        font.set_underline(underline)
+        font.set_bold(bold)
+        font.set_italic(italic)
+        self.fonts[key] = font
+        self.misses += 1
+
+        return font
+
+    def stats(self):
+        """
+        Return how many fonts are resident and how often they were reused.
+        """
+        return {'fonts': len(self.fonts),
+                'hits': self.hits,
+                'misses': self.misses}
+
+
+class TextCache(object):
+    """
+    Rendered text surfaces keyed by (font, text, antialias, color,
+    background), evicted least recently used first once their pixels
+    take up more than max_bytes.  The surfaces are shared, so callers
+    must blit them rather than draw on them.
+    """
+    def __init__(self, max_bytes=None):
+        self.cache = cache.LRUCache(max_bytes, cache.surface_bytes)
+
+    def render(self, font, text, antialias, color, background=None):
+        """
+        Same as font.render(text, antialias, color, background).
+        """
+        if background is not None:
+            background = tuple(background)
+        key = font, text, antialias, tuple(color), background
+
+        surface = self.cache.get(key)
+        if surface is None:
+            if background is None:
+                surface = font.render(text, antialias, color)
+            else:
+                surface = font.render(text, antialias, color, background)
+            self.cache.put(key, surface)
+
+        return surface
+
+    def stats(self):
+        return self.cache.stats()
@@ -4,43 +4,221 @@ This is a test of using the pytmx library with Tiled.
 import pygame as pg
 
 from . import pytmx
+from .pytmx import compiled
+from . import setup, profiler
+from . import constants as c
+
+
+#Surface.blits was added in pygame 1.9.4.
+if hasattr(pg.Surface, 'blits'):
+    def blit_all(surface, blits):
+        surface.blits(blits, 0)
+else:
+    def blit_all(surface, blits):
+        for source, position, area in blits:
+            surface.blit(source, position, area)
+
+
+def map_source(filename):
+    """
+    Return the file object to read a tmx file from, if it is bundled.
+    """
+    if setup.BUNDLE and filename in setup.BUNDLE:
+        return setup.BUNDLE.open(filename)
+    return None
+
+
+def parse_map(filename):
+    """
+    Parse a tmx file without loading its images.  Doesn't touch any
+    surfaces, so it can run on another thread; pass the result to
+    Renderer to finish loading it.
+    """
+    return compiled.load_map(filename, map_source(filename), c.TMX_CACHE_DIR)
 
 
 class Renderer(object):
     """
     This object renders tile maps from Tiled
     """
-    def __init__(self, filename):
-        tm = pytmx.load_pygame(filename, pixelalpha=True)
+    def __init__(self, filename, tmx_data=None):
+        self.pixelalpha = True
+        options = {'pixelalpha': self.pixelalpha,
+                   'atlas': setup.ATLAS,
+                   'tileset_cache': setup.TILESETS,
+                   'cache_dir': c.TMX_CACHE_DIR,
+                   'tiledmap': tmx_data}
+        source = map_source(filename)
+        if source is not None:
+            options['source'] = source
+            options['image_loader'] = setup.BUNDLE.load_surface
+        with profiler.phase('load ' + filename):
+            tm = pytmx.load_pygame(filename, **options)
         self.size = tm.width * tm.tilewidth, tm.height * tm.tileheight
         self.tmx_data = tm
+        self.layer_blits = None
 
-    def render(self, surface):
-
+    def make_layer_blits(self):
+        """
+        Make a blit sequence of (atlas page, position, area) for each
+        visible layer, leaving out empty cells.
+        """
         tw = self.tmx_data.tilewidth
         th = self.tmx_data.tileheight
-        gt = self.tmx_data.getTileImageByGid
+        regions = self.tmx_data.regions
+        layer_blits = []
+
+        for layer in self.tmx_data.visibleLayers:
+            if isinstance(layer, pytmx.TiledLayer):
+                blits = [(regions[gid].surface, (x * tw, y * th), regions[gid].rect)
+                         for x, y, gid in layer if regions[gid]]
+
+            elif isinstance(layer, pytmx.TiledImageLayer) and regions[layer.gid]:
+                region = regions[layer.gid]
+                blits = [(region.surface, (0, 0), region.rect)]
+
+            else:
+                continue
+
+            layer_blits.append(blits)
+
+        return layer_blits
+
+    def render(self, surface):
+        """
+        Draw the map, one Surface.blits call per layer.
+        """
+        if self.layer_blits is None:
+            self.layer_blits = self.make_layer_blits()
 
         if self.tmx_data.background_color:
             surface.fill(self.tmx_data.background_color)
 
-        for layer in self.tmx_data.visibleLayers:
-            if isinstance(layer, pytmx.TiledLayer):
-                for x, y, gid in layer:
-                    tile = gt(gid)
-                    if tile:
-                        surface.blit(tile, (x * tw, y * th))
+        for blits in self.layer_blits:
+            blit_all(surface, blits)
+
+    def render_area(self, surface, area):
+        """
+        Draw the part of the map inside area onto surface at (0, 0).
+        """
+        if self.layer_blits is None:
+            self.layer_blits = self.make_layer_blits()
 
-            elif isinstance(layer, pytmx.TiledObjectGroup):
-                pass
+        if self.tmx_data.background_color:
+            surface.fill(self.tmx_data.background_color)
 
-            elif isinstance(layer, pytmx.TiledImageLayer):
-                image = gt(layer.gid)
-                if image:
-                    surface.blit(image, (0, 0))
+        left, top = area.topleft
+        for blits in self.layer_blits:
+            visible = [(source, (x - left, y - top), rect)
+                       for source, (x, y), rect in blits
+                       if area.colliderect((x, y), rect.size)]
+            blit_all(surface, visible)
 
     def make_2x_map(self):
-        temp_surface = pg.Surface(self.size)
-        self.render(temp_surface)
-        temp_surface = pg.transform.scale2x(temp_surface)
-        return temp_surface
\ No newline at end of file
+        """
+        Return the map rendered at twice its size.  Rendered maps are
+        kept in setup.MAP_CACHE and shared, so they must not be drawn on.
+        """
+        key = self.tmx_data.filename, 'scale2x', self.pixelalpha
+        temp_surface = setup.MAP_CACHE.get(key)
+        if temp_surface is None:
+            with profiler.phase('render ' + self.tmx_data.filename):
+                temp_surface = pg.Surface(self.size)
+                self.render(temp_surface)
+                temp_surface = pg.transform.scale2x(temp_surface)
+            setup.MAP_CACHE.put(key, temp_surface)
+        return temp_surface
+
+
+class ChunkedMap(object):
+    """
+    The map at twice its size, split into square chunks that are only
+    rendered once a viewport overlaps them.  Chunks are kept in an LRU
+    cache, so memory use depends on the screen size rather than on the
+    size of the map.
+    """
+    def __init__(self, renderer, chunks, chunk_size):
+        self.renderer = renderer
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        width, height = renderer.size
+        self.rect = pg.Rect(0, 0, width * 2, height * 2)
+
+    def get_size(self):
+        return self.rect.size
+
+    def get_rect(self, **kwargs):
+        """
+        Same as Surface.get_rect for the full 2x map.
+        """
+        rect = self.rect.copy()
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def chunk_key(self, column, row):
+        return (self.renderer.tmx_data.filename, self.renderer.pixelalpha,
+                self.chunk_size, column, row)
+
+    def has_chunk(self, column, row):
+        return self.chunk_key(column, row) in self.chunks
+
+    def get_chunk(self, column, row):
+        """
+        Return the chunk at column, row, rendering it if it isn't cached.
+        """
+        chunk = self.chunks.get(self.chunk_key(column, row))
+        if chunk is None:
+            chunk = self.add_chunk(column, row, self.render_chunk(column, row))
+        return chunk
+
+    def add_chunk(self, column, row, chunk):
+        """
+        Convert a chunk from render_chunk to the display format and
+        cache it.
+        """
+        chunk = chunk.convert()
+        self.chunks.put(self.chunk_key(column, row), chunk)
+        return chunk
+
+    def chunks_in(self, rect):
+        """
+        Return the (column, row) of every chunk rect overlaps.
+        """
+        visible = rect.clip(self.rect)
+        size = self.chunk_size
+        columns = range(visible.left // size, (visible.right - 1) // size + 1)
+        rows = range(visible.top // size, (visible.bottom - 1) // size + 1)
+        return [(column, row) for row in rows for column in columns]
+
+    def render_chunk(self, column, row):
+        """
+        Render one chunk, not yet converted to the display format.
+        scale2x looks at the neighbours of every pixel, so a one pixel
+        border is rendered around the chunk and cut off afterwards;
+        chunks then match the same area of make_2x_map().
+        """
+        size = self.chunk_size // 2
+        area = pg.Rect(column * size, row * size, size, size)
+        area = area.clip(pg.Rect((0, 0), self.renderer.size))
+        border = area.inflate(2, 2).clip(pg.Rect((0, 0), self.renderer.size))
+
+        small = pg.Surface(border.size)
+        self.renderer.render_area(small, border)
+        scaled = pg.transform.scale2x(small)
+
+        inside = pg.Rect((area.x - border.x) * 2, (area.y - border.y) * 2,
+                         area.width * 2, area.height * 2)
+        return scaled.subsurface(inside)
+
+    def draw(self, surface, viewport):
+        """
+        Draw the part of the map under viewport onto surface at (0, 0).
+        """
+        size = self.chunk_size
+        for column, row in self.chunks_in(viewport):
+            position = column * size - viewport.x, row * size - viewport.y
+            surface.blit(self.get_chunk(column, row), position)
+
+    def stats(self):
+        return self.chunks.stats()
@@ -1,8 +1,22 @@
 __author__ = 'justinarmstrong'
 
-import os, random
+import math, os, random
+from multiprocessing.pool import ThreadPool
 import pygame as pg
 from . import constants as c
+from . import profiler
+from .cache import timer
+
+IDLE_TICK_EVENT = pg.USEREVENT + 1
+
+
+def cpu_time():
+    """
+    Return the CPU seconds this process has used.
+    """
+    times = os.times()
+    return times[0] + times[1]
+
 
 class Control(object):
     """
@@ -10,42 +24,114 @@ class Control(object):
     the event_loop which passes events to States as needed.  Logic for flipping
     states is also found here.
     """
-    def __init__(self, caption):
+    def __init__(self, caption, music_player=None, idle_mode=True):
         self.screen = pg.display.get_surface()
         self.done = False
         self.clock = pg.time.Clock()
         self.caption = caption
-        self.fps = 60
         self.show_fps = False
         self.current_time = 0.0
         self.keys = pg.key.get_pressed()
         self.state_dict = {}
         self.state_name = None
         self.state = None
+        self.prebuild_next = True
+        self.music_player = music_player
+        self.full_update = True
+        self.pixels_pushed = {}
+        self.idle_mode = idle_mode
+        self.cpu_used = {}
+        self.accumulator = 0.0
+        self.last_tick = 0.0
 
     def setup_states(self, state_dict, start_state):
+        """
+        state_dict maps state names to states, or to factories that
+        build the state the first time it is entered.
+        """
         self.state_dict = state_dict
         self.state_name = start_state
-        self.state = self.state_dict[self.state_name]
+        self.state = self.get_state(self.state_name)
         self.set_music()
 
+    def get_state(self, name):
+        """
+        Return the named state, building it first if needed.
+        """
+        state = self.state_dict[name]
+        if not isinstance(state, _State):
+            with profiler.phase('build ' + name):
+                state = state()
+            self.state_dict[name] = state
+        return state
+
+    def build_next_state(self):
+        """
+        Build the state the current one will flip to, if it is known and
+        not built yet.  Called between frames, so that the flip itself
+        does not have to.
+        """
+        name = self.state.next
+        if name in self.state_dict and not isinstance(self.state_dict[name], _State):
+            self.get_state(name)
+
     def update(self):
-        self.current_time = pg.time.get_ticks()
+        """
+        Advance the game by one simulation step.  current_time is game
+        time, which moves SIM_STEP ms per step however long frames take.
+        """
+        self.current_time += c.SIM_STEP
         if self.state.quit:
             self.done = True
         elif self.state.done:
             self.flip_state()
-        self.state.update(self.screen, self.keys, self.current_time)
+        self.state.update(self.keys, self.current_time)
+
+    def advance(self):
+        """
+        Run the simulation steps owed for the time since the last call
+        and return how many ran.  After MAX_SIM_STEPS the rest of the
+        debt is dropped, so a slow machine plays slower instead of
+        falling further and further behind.
+        """
+        now = timer()
+        self.accumulator += (now - self.last_tick) * 1000.0
+        self.last_tick = now
+
+        steps = 0
+        while self.accumulator >= c.SIM_STEP and not self.done:
+            if steps == c.MAX_SIM_STEPS:
+                self.accumulator = 0.0
+                break
+            self.update()
+            self.accumulator -= c.SIM_STEP
+            steps += 1
+
+        return steps
+
+    def draw(self):
+        self.state.draw(self.screen)
+
+    def wait_for_step(self):
+        """
+        Sleep until the next simulation step is due.  Frames are paced
+        by the simulation rather than by a frame cap, so each one runs
+        a single step instead of now and then none and then two.
+        """
+        owed = self.accumulator + (timer() - self.last_tick) * 1000.0
+        if owed < c.SIM_STEP:
+            pg.time.wait(int(math.ceil(c.SIM_STEP - owed)))
 
     def flip_state(self):
         previous, self.state_name = self.state_name, self.state.next
         previous_music = self.state.music_title
         persist = self.state.cleanup()
-        self.state = self.state_dict[self.state_name]
+        self.state = self.get_state(self.state_name)
         self.state.previous = previous
         self.state.previous_music = previous_music
         self.state.startup(self.current_time, persist)
         self.set_music()
+        self.full_update = True
 
     def set_music(self):
         """
@@ -53,11 +139,17 @@ class Control(object):
         """
         if self.state.music_title == self.state.previous_music:
             pass
+        elif self.state.music and self.music_player:
+            self.music_player.play(self.state.music, self.state.volume)
         elif self.state.music:
             pg.mixer.music.load(self.state.music)
             pg.mixer.music.set_volume(self.state.volume)
             pg.mixer.music.play(-1)
 
+        if self.music_player:
+            for music in self.state.predict_music():
+                self.music_player.prefetch(music)
+
     def event_loop(self):
         self.events = pg.event.get()
 
@@ -72,6 +164,95 @@ class Control(object):
                 self.keys = pg.key.get_pressed()
                 self.state.get_event(event)
 
+    def update_display(self):
+        """
+        Push the parts of the screen the state changed to the display,
+        or all of it if the state can't tell or a new state started.
+        """
+        screen_rect = self.screen.get_rect()
+        rects = None if self.full_update else self.state.dirty_rects()
+        self.full_update = False
+
+        if rects is None:
+            pg.display.update()
+            pixels = screen_rect.width * screen_rect.height
+        else:
+            rects = [screen_rect.clip(rect) for rect in rects]
+            pg.display.update(rects)
+            pixels = sum(rect.width * rect.height for rect in rects)
+
+        counter = self.pixels_pushed.setdefault(self.state_name, [0, 0])
+        counter[0] += 1
+        counter[1] += pixels
+
+    def push_stats(self):
+        """
+        Return the average number of pixels pushed per frame, by state.
+        """
+        return dict((name, pixels / float(frames))
+                    for name, (frames, pixels) in self.pixels_pushed.items())
+
+    def is_idle(self):
+        """
+        Return True if the screen will not change until an event
+        arrives: the state says it is still, no key is held down and
+        the music is not fading.
+        """
+        if not self.idle_mode or any(self.keys) or not self.state.is_idle():
+            return False
+        return self.music_player is None or self.music_player.is_settled()
+
+    def wait_for_event(self):
+        """
+        Sleep until an event arrives, waking every IDLE_TICK ms so
+        background work such as preloading still gets to run.  The
+        event is put back for event_loop.
+        """
+        pg.time.set_timer(IDLE_TICK_EVENT, c.IDLE_TICK)
+        event = pg.event.wait()
+        pg.time.set_timer(IDLE_TICK_EVENT, 0)
+        if event.type != IDLE_TICK_EVENT:
+            pg.event.post(event)
+        # time spent asleep is not owed to the simulation
+        self.last_tick = timer()
+
+    def cpu_stats(self):
+        """
+        Return the share of one core used while in each state.
+        """
+        return dict((name, cpu / wall)
+                    for name, (wall, cpu) in self.cpu_used.items() if wall)
+
+    def turbo(self, steps, draw=False):
+        """
+        Run steps simulation steps back to back: no frame cap, no
+        display updates, no idle waits and no music.  States are only
+        drawn if draw is True.  Return the number of steps run, the
+        wall clock time they took and the steps run in each state.
+        """
+        if self.music_player:
+            self.music_player.enabled = False
+        states = {}
+        start = timer()
+
+        ran = 0
+        while ran < steps and not self.done:
+            self.event_loop()
+            self.update()
+            if draw:
+                self.draw()
+            if self.prebuild_next:
+                self.build_next_state()
+            states[self.state_name] = states.get(self.state_name, 0) + 1
+            ran += 1
+
+        seconds = timer() - start
+        return {'steps': ran,
+                'seconds': seconds,
+                'steps per second': ran / seconds if seconds else 0.0,
+                'game seconds': ran * c.SIM_STEP / 1000.0,
+                'states': states}
+
     def toggle_show_fps(self, key):
         if key == pg.K_F5:
             self.show_fps = not self.show_fps
@@ -79,15 +260,37 @@ class Control(object):
                 pg.display.set_caption(self.caption)
 
     def main(self):
-        """Main loop for entire program"""
+        """
+        Main loop for entire program.  The game is updated at a fixed
+        SIM_RATE steps per second and drawn once per frame, after the
+        steps that frame owed.
+        """
+        self.last_tick = timer()
         while not self.done:
+            start, start_cpu = timer(), cpu_time()
             self.event_loop()
-            self.update()
-            pg.display.update()
-            self.clock.tick(self.fps)
+            self.advance()
+            self.draw()
+            self.update_display()
+            if self.music_player:
+                self.music_player.update()
+            if self.prebuild_next:
+                self.build_next_state()
+            if self.is_idle():
+                self.wait_for_event()
+            self.wait_for_step()
+            self.clock.tick()
+
+            used = self.cpu_used.setdefault(self.state_name, [0.0, 0.0])
+            used[0] += timer() - start
+            used[1] += cpu_time() - start_cpu
+
             if self.show_fps:
                 fps = self.clock.get_fps()
-                with_fps = "{} - {:.2f} FPS".format(self.caption, fps)
+                pushed = self.push_stats().get(self.state_name, 0)
+                cpu = self.cpu_stats().get(self.state_name, 0)
+                with_fps = "{} - {:.2f} FPS - {:.0f} px/frame - {:.0%} CPU".format(
+                    self.caption, fps, pushed, cpu)
                 pg.display.set_caption(with_fps)
 
 
@@ -116,49 +319,185 @@ class _State(object):
         self.done = False
         return self.game_data
 
-    def update(self, surface, keys, current_time):
+    def update(self, keys, current_time):
+        """
+        Advance the state by one simulation step.
+        """
         pass
 
+    def draw(self, surface):
+        """
+        Draw the state as the last update left it.
+        """
+        pass
 
-def load_all_gfx(directory, colorkey=(255,0,255), accept=('.png', 'jpg', 'bmp')):
-    graphics = {}
-    for pic in os.listdir(directory):
-        name, ext = os.path.splitext(pic)
+    def predict_music(self):
+        """
+        Return the music files this state is likely to switch to next,
+        so they can be read ahead of time.
+        """
+        return []
+
+    def dirty_rects(self):
+        """
+        Return the screen rects the last update changed, or None if the
+        whole screen should be pushed to the display.
+        """
+        return None
+
+    def is_idle(self):
+        """
+        Return True if nothing is animating, so the last frame will be
+        drawn again until input arrives.  The game loop then sleeps
+        instead of redrawing it 60 times a second.
+        """
+        return False
+
+
+class DirtyTracker(object):
+    """
+    Finds what changed between frames of a state that redraws a still
+    background and blits its moving parts through blit().  A blit is
+    unchanged if the same image object went to the same place last
+    frame, so images must be replaced, not drawn on, when they change.
+    """
+    def __init__(self):
+        self.previous = None
+        self.current = []
+
+    def blit(self, surface, image, position):
+        """
+        Blit image to surface and remember the area it covered.
+        """
+        rect = image.get_rect(topleft=pg.Rect(position).topleft)
+        surface.blit(image, rect)
+        self.current.append((image, tuple(rect)))
+        return rect
+
+    def wrap(self, surface):
+        """
+        Return a stand-in for surface whose blit() goes through the
+        tracker, for drawing code that only blits.
+        """
+        return TrackedSurface(self, surface)
+
+    def finish(self, still=True):
+        """
+        End the frame and return its dirty rects.  still is False if
+        the background moved or something was drawn without blit(),
+        in which case this frame and the next are pushed in full.
+        """
+        current = set(self.current)
+        self.current = []
+
+        if still and self.previous is not None:
+            rects = [pg.Rect(rect) for image, rect in current ^ self.previous]
+        else:
+            rects = None
+
+        self.previous = current if still else None
+        return rects
+
+
+class TrackedSurface(object):
+    def __init__(self, tracker, surface):
+        self.tracker = tracker
+        self.surface = surface
+
+    def blit(self, image, position):
+        return self.tracker.blit(self.surface, image, position)
+
+
+def load_gfx(path, colorkey=(255,0,255)):
+    """
+    Load a single image and convert it to the display format.
+    """
+    return convert_gfx(pg.image.load(path), colorkey)
+
+
+def convert_gfx(img, colorkey=(255,0,255)):
+    """
+    Convert a decoded image to the display format, using per-pixel
+    alpha if the image has it and a colorkey otherwise.
+    """
+    if img.get_alpha():
+        img = img.convert_alpha()
+    else:
+        img = img.convert()
+        img.set_colorkey(colorkey)
+    return img
+
+
+def find_files(directory, accept):
+    """
+    Return a dictionary of file names (without extension) to paths.
+    """
+    paths = {}
+    for filename in os.listdir(directory):
+        name, ext = os.path.splitext(filename)
         if ext.lower() in accept:
-            img = pg.image.load(os.path.join(directory, pic))
-            if img.get_alpha():
-                img = img.convert_alpha()
-            else:
-                img = img.convert()
-                img.set_colorkey(colorkey)
-            graphics[name] = img
+            paths[name] = os.path.join(directory, filename)
+    return paths
+
+
+def decode_all(paths, decoder, workers=0):
+    """
+    Run decoder over a dictionary of paths.  With workers > 0 the files
+    are decoded on a thread pool; pygame releases the GIL while it
+    decodes images and sounds, so this uses more than one core.
+    """
+    if not workers:
+        return dict((name, decoder(path)) for name, path in paths.items())
+
+    names = list(paths)
+    pool = ThreadPool(workers)
+    try:
+        decoded = pool.map(decoder, [paths[name] for name in names])
+    finally:
+        pool.close()
+        pool.join()
+
+    return dict(zip(names, decoded))
+
+
+def load_all_gfx(directory, colorkey=(255,0,255), accept=('.png', 'jpg', 'bmp'),
+                 workers=0):
+    """
+    Load every image in directory.  Decoding can run on a pool of
+    worker threads, but converting to the display format always
+    happens on the calling thread.
+    """
+    images = decode_all(find_files(directory, accept), pg.image.load, workers)
+    graphics = {}
+    for name, img in images.items():
+        graphics[name] = convert_gfx(img, colorkey)
     return graphics
 
 
 def load_all_music(directory, accept=('.wav', '.mp3', '.ogg', '.mdi')):
-    songs = {}
-    for song in os.listdir(directory):
-        name, ext = os.path.splitext(song)
-        if ext.lower() in accept:
-            songs[name] = os.path.join(directory, song)
-    return songs
+    return find_files(directory, accept)
 
 
 def load_all_fonts(directory, accept=('.ttf')):
     return load_all_music(directory, accept)
 
 
-def load_all_tmx(directory, accept=('.tmx')):
+def load_all_tmx(directory, accept=('.tmx',)):
     return load_all_music(directory, accept)
 
 
-def load_all_sfx(directory, accept=('.wav','.mp3','.ogg','.mdi')):
-    effects = {}
-    for fx in os.listdir(directory):
-        name, ext = os.path.splitext(fx)
-        if ext.lower() in accept:
-            effects[name] = pg.mixer.Sound(os.path.join(directory, fx))
-    return effects
+def load_sfx(path):
+    """
+    Load a single sound effect.
+    """
+    return pg.mixer.Sound(path)
+
+
+def load_all_sfx(directory, accept=('.wav','.mp3','.ogg','.mdi'), workers=0):
+    """
+    Load every sound effect in directory, optionally on worker threads.
+    """
+    return decode_all(find_files(directory, accept), load_sfx, workers)
 
 
 def get_image(x, y, width, height, sprite_sheet):
@@ -182,6 +521,77 @@ def get_tile(x, y, tileset, width=16, height=16, scale=1):
 
     return tile_dict
 
+
+#Frame cache flags
+SCALE2X = 1
+
+
+class FrameCache(object):
+    """
+    Process-wide cache of frames cut out of sprite sheets, keyed by
+    (sheet, rect, scale, flags).  Every sprite showing the same frame
+    shares one Surface, so frames must be treated as read-only.  If an
+    atlas set is given, frames are packed into it and the returned
+    Surfaces are views of their atlas regions.
+    """
+    def __init__(self, sheets, atlases=None):
+        self.sheets = sheets
+        self.atlases = atlases
+        self.frames = {}
+        self.frame_keys = {}
+
+    def get(self, sheet_key, x, y, width, height, scale=1, flags=0):
+        """
+        Return the frame at (x, y, width, height) of a sprite sheet.
+        Frames are scaled with pg.transform.scale, or repeated scale2x
+        passes if the SCALE2X flag is set.
+        """
+        key = sheet_key, (x, y, width, height), scale, flags
+        try:
+            return self.frames[key]
+        except KeyError:
+            pass
+
+        if scale == 1:
+            frame = get_image(x, y, width, height, self.sheets[sheet_key])
+        else:
+            frame = self.get(sheet_key, x, y, width, height)
+            if flags & SCALE2X:
+                while frame.get_width() < width * scale:
+                    frame = pg.transform.scale2x(frame)
+            else:
+                frame = pg.transform.scale(frame, (width*scale, height*scale))
+
+        if self.atlases is not None:
+            frame = self.atlases.add(('frame',) + key, frame).image
+
+        self.frames[key] = frame
+        self.frame_keys[id(frame)] = key
+        return frame
+
+    def scale2x(self, frame):
+        """
+        Cached version of pg.transform.scale2x for frames from this
+        cache.  Other surfaces are scaled as normal.
+        """
+        try:
+            sheet_key, rect, scale, flags = self.frame_keys[id(frame)]
+        except KeyError:
+            return pg.transform.scale2x(frame)
+
+        if scale != 1 and not flags & SCALE2X:
+            return pg.transform.scale2x(frame)
+
+        return self.get(sheet_key, *rect, scale=scale*2, flags=flags|SCALE2X)
+
+    def stats(self):
+        """
+        Return the number of cached frames and their pixel bytes.
+        """
+        size = sum(frame.get_bytesize() * frame.get_width() * frame.get_height()
+                   for frame in self.frames.values())
+        return {'frames': len(self.frames), 'bytes': size}
+
 def notify_observers(self, event):
     """
     Notify all observers of events.